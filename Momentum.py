@@ -1,6 +1,9 @@
+import argparse
 import pandas as pd
 from datetime import datetime
 import os
+from result_writers import SUPPORTED_FORMATS, write_results
+from cache import memoize
 
 # Timeframe mapping
 DAYS_MAP = {
@@ -11,6 +14,9 @@ DAYS_MAP = {
     
 }
 
+# Default sink for results; "parquet" or "csv" suit batch and historical runs
+output_format = "xlsx"
+
 def build_price_history(xls, sheet_dates):
     """Extracts price history for each symbol across active trading days."""
     price_history = {}
@@ -54,28 +60,14 @@ def get_sheet_dates(sheet_names, ref_date=None):
     sheets_with_dates.sort(reverse=True)
     return sheets_with_dates
 
-def generate_summary_excel_optimized(file_path, output_path=None, reference_date_str=None):
-    ref_date = None
-    if reference_date_str:
-        try:
-            ref_date = datetime.strptime(reference_date_str, "%Y_%m_%d")
-        except ValueError:
-            print("⚠️ Invalid reference date format. Use YYYY-MM-DD. Defaulting to latest date.")
-
-
-    # Build dynamic output path
-    os.makedirs("Results Momentum", exist_ok=True)
-    filename = f"Custom Stock Momentum {reference_date_str}.xlsx"
-    
-    output_path = os.path.join("Results Momentum", filename)
-
-
+@memoize(file_args=("file_path",), depends=lambda: DAYS_MAP)
+def compute_momentum_summary(file_path, ref_date=None):
+    """Returns one row per symbol with DAYS_MAP returns (as fractions), or None if no sheet qualifies."""
     xls = pd.ExcelFile(file_path)
     sheet_dates = get_sheet_dates(xls.sheet_names, ref_date)
 
     if not sheet_dates:
-        print("❌ No valid sheets found up to the reference date.")
-        return
+        return None
 
     print("📊 Building price history...")
     price_history = build_price_history(xls, sheet_dates)
@@ -89,7 +81,7 @@ def generate_summary_excel_optimized(file_path, output_path=None, reference_date
         for i, symbol in enumerate(symbols):
             history = price_history[symbol]
             if len(history) <= days:
-                summary_rows[i][label] = "N/A"
+                summary_rows[i][label] = None
                 continue
 
             # Use the first date as the reference (most recent before or equal to ref_date)
@@ -101,46 +93,71 @@ def generate_summary_excel_optimized(file_path, output_path=None, reference_date
                         break
 
             if reference_index + days >= len(history):
-                summary_rows[i][label] = "N/A"
+                summary_rows[i][label] = None
                 continue
 
             end_price = history[reference_index][1]
             start_price = history[reference_index + days][1]
-            ret = ((end_price - start_price) / start_price) * 100
-            summary_rows[i][label] = f"{ret:.2f}%"
+            summary_rows[i][label] = (end_price - start_price) / start_price
 
         print(f"✅ {label} computation completed.")
 
 
 
     for row in summary_rows:
-        week = row.get("One Week Return", "N/A")
-        month = row.get("One Month Return", "N/A")
+        week_val = row.get("One Week Return")
+        month_val = row.get("One Month Return")
+
+        if week_val is None or month_val is None:
+            row["Week-Month"] = None
+            row["Month>Week"] = None
+            continue
+
+        # Compute absolute difference
+        row["Week-Month"] = abs(abs(week_val) - abs(month_val))
+
+        # Check if Month > Week
+        row["Month>Week"] = month_val > week_val
+
+    return pd.DataFrame(summary_rows)
 
+def generate_summary_excel_optimized(file_path, output_path=None, reference_date_str=None, output_format=output_format):
+    ref_date = None
+    if reference_date_str:
         try:
-            week_val = float(week.strip('%'))
-            month_val = float(month.strip('%'))
+            ref_date = datetime.strptime(reference_date_str, "%Y_%m_%d")
+        except ValueError:
+            print("⚠️ Invalid reference date format. Use YYYY-MM-DD. Defaulting to latest date.")
 
-            # Compute absolute difference
-            row["Week-Month"] = f"{abs(abs(week_val) - abs(month_val)):.2f}%"
 
-            # Check if Month > Week
-            row["Month>Week"] = month_val > week_val
+    # Build dynamic output path unless one was given
+    if output_path is None:
+        os.makedirs("Results Momentum", exist_ok=True)
+        filename = f"Custom Stock Momentum {reference_date_str}.xlsx"
+        output_path = os.path.join("Results Momentum", filename)
 
-        except Exception:
-            row["Week-Month"] = "N/A"
-            row["Month>Week"] = "N/A"
 
-    print("💾 Writing to Excel...")
-    df_summary = pd.DataFrame(summary_rows)
-    df_summary.to_excel(output_path, index=False)
+    df_summary = compute_momentum_summary(file_path, ref_date)
+    if df_summary is None:
+        print("❌ No valid sheets found up to the reference date.")
+        return
+
+    print(f"💾 Writing {output_format}...")
+    percent_columns = list(DAYS_MAP) + ["Week-Month"]
+    output_path = write_results(df_summary, output_path, output_format, percent_columns)
     print(f"🎉 Done: Output saved to {output_path}")
 
 
 # Example usage
 if __name__ == "__main__":
-    
+    parser = argparse.ArgumentParser(description="Write DAYS_MAP momentum returns for every symbol.")
+    parser.add_argument("--date", help="Reference date as YYYY_MM_DD (prompted for when omitted)")
+    parser.add_argument("--excel", default="combined_excel.xlsx")
+    parser.add_argument("--format", default=output_format, choices=SUPPORTED_FORMATS)
+    parser.add_argument("--output", default=None, help="Output path (extension follows --format)")
+    args = parser.parse_args()
+
     # Use a specific reference date (e.g., May 25, 2025)
-    reference_date_str=input("Enter date in format YYYY_MM_DD: ")
-    generate_summary_excel_optimized("combined_excel.xlsx", reference_date_str=reference_date_str)
+    reference_date_str = args.date or input("Enter date in format YYYY_MM_DD: ")
+    generate_summary_excel_optimized(args.excel, args.output, reference_date_str, args.format)
 
@@ -0,0 +1,126 @@
+import sys
+import numpy as np
+import pandas as pd
+from Momentum import DAYS_MAP
+from market_data import SymbolTable, load_market_data
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+sma_windows = [50, 200]
+high_low_window = 250  # ~52 weeks of NEPSE trading days
+
+
+class BreadthEngine:
+    """Daily cross-sectional market statistics over the date x symbol close matrix.
+
+    Each update() only processes days after the last one seen, reusing the trailing
+    rows needed by the longest window, so a year of history and a single new day
+    go through the same vectorized code path.
+
+    Days on which every listed symbol repeats its previous close are treated as market
+    holidays and skipped, the matrix analogue of golden_cross dropping unchanged closes.
+    """
+
+    __slots__ = ("symbols", "tail", "last_date", "breadth", "rs_composite", "rs_latest")
+
+    def __init__(self):
+        self.symbols = SymbolTable()
+        self.tail = np.empty((0, 0), dtype=np.float64)
+        self.last_date = None
+        self.breadth = pd.DataFrame()
+        self.rs_composite = pd.DataFrame()
+        self.rs_latest = pd.DataFrame()
+
+    @property
+    def history(self):
+        return max(max(sma_windows), high_low_window, max(DAYS_MAP.values())) + 1
+
+    def update(self, data):
+        """Adds breadth rows for MarketData days after the last processed date; returns them."""
+        if self.last_date is not None:
+            data = data.between(self.last_date + np.timedelta64(1, "D"))
+        if len(data) == 0:
+            return pd.DataFrame()
+
+        remap = np.array([self.symbols.code(name) for name in data.symbols.names], dtype=np.int64)
+        raw = np.full((len(data.calendar), len(self.symbols)), np.nan)
+        raw[data.date_index, remap[data.symbol_code]] = data.close
+        day_has_rows = np.zeros(len(data.calendar), dtype=bool)
+        day_has_rows[data.date_index] = True
+        raw, dates = raw[day_has_rows], data.calendar[day_has_rows]
+
+        tail = np.hstack([self.tail, np.full((self.tail.shape[0], len(self.symbols) - self.tail.shape[1]), np.nan)])
+        n_tail = tail.shape[0]
+        closes = pd.DataFrame(np.vstack([tail, raw])).ffill().to_numpy()
+        present = np.vstack([np.zeros(tail.shape, dtype=bool), ~np.isnan(raw)])
+        previous = np.vstack([np.full((1, closes.shape[1]), np.nan), closes[:-1]])
+
+        changed = present & (closes != previous) & ~np.isnan(previous)
+        first_day = ~(present & ~np.isnan(previous)).any(axis=1)
+        trading_day = np.r_[np.ones(n_tail, dtype=bool), (changed | first_day[:, None])[n_tail:].any(axis=1)]
+        closes, present = closes[trading_day], present[trading_day]
+        previous = np.vstack([np.full((1, closes.shape[1]), np.nan), closes[:-1]])
+        dates = dates[trading_day[n_tail:]]
+        if len(dates) == 0:
+            return pd.DataFrame()
+
+        new = slice(n_tail, None)
+        rows = self._breadth_rows(closes, previous, present, new, dates)
+        ranks = self._rs_ranks(closes, present, new, dates)
+
+        if self.breadth.empty:
+            self.breadth, self.rs_composite = rows, ranks["Composite"]
+        else:
+            self.breadth = pd.concat([self.breadth, rows])
+            self.rs_composite = pd.concat([self.rs_composite.reindex(columns=self.symbols.names), ranks["Composite"]])
+        self.breadth["AD Line"] = (self.breadth["Advances"] - self.breadth["Declines"]).cumsum()
+        self.rs_latest = pd.DataFrame({label: r.iloc[-1] for label, r in ranks.items()})
+        self.rs_latest.index.name = "Symbol"
+        self.tail = closes[-self.history:]
+        self.last_date = dates[-1]
+        return self.breadth.loc[rows.index]
+
+    def _breadth_rows(self, closes, previous, present, new, dates):
+        frame = pd.DataFrame(closes)
+        listed = present[new]
+        rows = {
+            "Advances": (listed & (closes[new] > previous[new])).sum(axis=1),
+            "Declines": (listed & (closes[new] < previous[new])).sum(axis=1),
+            "Unchanged": (listed & (closes[new] == previous[new])).sum(axis=1),
+            "Listed": listed.sum(axis=1),
+        }
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for n in sma_windows:
+                sma = frame.rolling(window=n, min_periods=n).mean().to_numpy()[new]
+                eligible = listed & ~np.isnan(sma)
+                rows[f"% Above SMA{n}"] = (eligible & (closes[new] > sma)).sum(axis=1) / eligible.sum(axis=1) * 100
+
+            prior = frame.shift(1).rolling(window=high_low_window, min_periods=high_low_window)
+            prior_high = prior.max().to_numpy()[new]
+            prior_low = prior.min().to_numpy()[new]
+        rows["New Highs"] = (listed & (closes[new] > prior_high)).sum(axis=1)
+        rows["New Lows"] = (listed & (closes[new] < prior_low)).sum(axis=1)
+        return pd.DataFrame(rows, index=pd.DatetimeIndex(dates, name="Date"))
+
+    def _rs_ranks(self, closes, present, new, dates):
+        """Percentile rank (0-100) of each symbol's DAYS_MAP returns among symbols listed that day."""
+        frame = pd.DataFrame(closes)
+        index = pd.DatetimeIndex(dates, name="Date")
+        ranks = {}
+        for label, days in DAYS_MAP.items():
+            returns = (frame / frame.shift(days) - 1).to_numpy()[new]
+            returns[~present[new]] = np.nan
+            ranks[label] = pd.DataFrame(returns, index=index, columns=self.symbols.names).rank(axis=1, pct=True) * 100
+        ranks["Composite"] = pd.concat(ranks.values()).groupby(level=0).mean().reindex(index)
+        return ranks
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else excel_path
+    print(f"📊 Loading {path}...")
+    engine = BreadthEngine()
+    engine.update(load_market_data(path))
+    print("\n📈 Market breadth (last 10 trading days):")
+    print(engine.breadth.tail(10).round(2).to_string())
+    print(f"\n🏆 Top 10 relative strength on {engine.last_date}:")
+    print(engine.rs_latest.sort_values("Composite", ascending=False).head(10).round(1).to_string())
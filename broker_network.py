@@ -0,0 +1,132 @@
+import sys
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sheet_index import get_sheet_index
+
+# --- CONFIG ---
+broker_path = "Broker_Analysis.xlsx"
+BROKER_DATE_FORMAT = "%Y-%m-%d"
+top_cols = ['Top 1', 'Top 2', 'Top 3', 'Top 4', 'Top 5']
+max_cached = 32
+
+
+class BrokerNetwork:
+    """Broker x company holdings from every Broker_Analysis sheet as sparse matrices.
+
+    Each (date, broker, company) appearance in a Top 1-5 column is one entry, stored
+    date-sorted so any run of sheets aggregates into a CSR matrix with a slice and a
+    single sparse constructor. Similarities are cosine similarities of those rows
+    (brokers) or columns (companies), i.e. co-holding overlap normalized for size.
+    """
+
+    def __init__(self, dates, brokers, companies, date_idx, broker_idx, company_idx):
+        self.dates = dates
+        self.brokers = brokers
+        self.companies = companies
+        self.broker_codes = {name: i for i, name in enumerate(brokers)}
+        self.company_codes = {name: i for i, name in enumerate(companies)}
+        order = np.argsort(date_idx, kind="stable")
+        self.date_idx = date_idx[order]
+        self.broker_idx = broker_idx[order]
+        self.company_idx = company_idx[order]
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_excel(cls, broker_path=broker_path):
+        index = get_sheet_index(broker_path, BROKER_DATE_FORMAT)
+        sheets = index.read_range()
+        dates = np.array([date for date, _ in sheets], dtype="datetime64[D]")
+
+        frames = []
+        for idx, (_, df) in enumerate(sheets):
+            if df.empty:
+                continue
+            broker_col = df.columns[0]
+            long = df.melt(id_vars=[broker_col], value_vars=[c for c in top_cols if c in df.columns], value_name="Entry")
+            long["Company"] = long["Entry"].str.split('/').str[0].str.strip()
+            long = long.dropna(subset=[broker_col, "Company"])
+            frames.append(pd.DataFrame({
+                "Date": idx,
+                "Broker": long[broker_col].astype(str).str.strip(),
+                "Company": long["Company"],
+            }))
+        holdings = pd.concat(frames, ignore_index=True).drop_duplicates()
+        broker_idx, brokers = pd.factorize(holdings["Broker"], sort=True)
+        company_idx, companies = pd.factorize(holdings["Company"], sort=True)
+        return cls(dates, list(brokers), list(companies),
+                   holdings["Date"].to_numpy(dtype=np.int32), broker_idx.astype(np.int32), company_idx.astype(np.int32))
+
+    def select(self, start=None, end=None, last=None):
+        """Date positions [lo, hi) for start..end (inclusive) or the `last` sheets."""
+        if last is not None:
+            return max(len(self.dates) - last, 0), len(self.dates)
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        return lo, hi
+
+    def matrix(self, start=None, end=None, last=None):
+        """CSR broker x company matrix counting in how many selected sheets each pair appears."""
+        key = self.select(start, end, last)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        lo, hi = np.searchsorted(self.date_idx, key[0]), np.searchsorted(self.date_idx, key[1])
+        shape = (len(self.brokers), len(self.companies))
+        result = sparse.csr_matrix(
+            (np.ones(hi - lo, dtype=np.float64), (self.broker_idx[lo:hi], self.company_idx[lo:hi])), shape=shape)
+        self._cache[key] = result
+        if len(self._cache) > max_cached:
+            self._cache.popitem(last=False)
+        return result
+
+    def _similar(self, matrix, names, codes, name, top):
+        if name not in codes:
+            raise KeyError(f"'{name}' not found")
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        row = matrix[codes[name]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.asarray((matrix @ row.T).todense()).ravel() / (norms * norms[codes[name]])
+        scores[codes[name]] = np.nan
+        result = pd.Series(scores, index=names, name="Similarity").dropna()
+        return result[result > 0].sort_values(ascending=False).head(top)
+
+    def similar_brokers(self, broker, start=None, end=None, last=None, top=10):
+        return self._similar(self.matrix(start, end, last), self.brokers, self.broker_codes, broker, top)
+
+    def similar_companies(self, company, start=None, end=None, last=None, top=10):
+        matrix = self.matrix(start, end, last).T.tocsr()
+        return self._similar(matrix, self.companies, self.company_codes, company.strip().upper(), top)
+
+    def co_holding(self, kind="broker", start=None, end=None, last=None):
+        """Sparse cosine-similarity matrix between all brokers (or all companies)."""
+        matrix = self.matrix(start, end, last)
+        if kind == "company":
+            matrix = matrix.T.tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        scale = sparse.diags(np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0))
+        normalized = scale @ matrix
+        return (normalized @ normalized.T).tocsr()
+
+    def similarity_over_time(self, a, b, kind="broker", window=5):
+        """Cosine similarity of two brokers (or companies) over a rolling window of sheets."""
+        values = []
+        for stop in range(window, len(self.dates) + 1):
+            matrix = self.matrix(self.dates[stop - window], self.dates[stop - 1])
+            codes = self.broker_codes
+            if kind == "company":
+                matrix, codes = matrix.T.tocsr(), self.company_codes
+            x, y = matrix[codes[a]], matrix[codes[b]]
+            denom = np.sqrt(x.multiply(x).sum() * y.multiply(y).sum())
+            values.append(x.multiply(y).sum() / denom if denom else np.nan)
+        return pd.Series(values, index=pd.DatetimeIndex(self.dates[window - 1:], name="Date"), name=f"{a}~{b}")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else broker_path
+    network = BrokerNetwork.from_excel(path)
+    broker = sys.argv[2] if len(sys.argv) > 2 else network.brokers[0]
+    print(f"🕸️ {len(network.brokers)} brokers x {len(network.companies)} companies over {len(network.dates)} sheets")
+    print(f"\n🤝 Brokers most similar to {broker} (last 5 sheets):")
+    print(network.similar_brokers(broker, last=5).round(3).to_string())
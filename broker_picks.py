@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+import os
+import re
+from datetime import datetime
+from openpyxl import Workbook, load_workbook
+from playwright.async_api import async_playwright
+
+# --- CONFIG ---
+URL = "https://nepsealpha.com/nepse-chart"
+output_path = "Broker_Analysis.xlsx"
+timeout_ms = 20000
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+)
+BLOCKED_RESOURCES = {"image", "font", "media"}
+
+# Sheet layout that top_broker, Broker_holdings, broker_network and broker_rankings read:
+# the broker column first, then Top 1..Top 5 as "COMPANY/qty/price".
+BROKER_HEADER = "Net Holding Brokers (1 M)"
+TOP_HEADERS = [f"Top {i}" for i in range(1, 6)]
+
+FIRST_BUTTON = 'xpath=//*[@id="app"]/div[1]/div[1]/div[3]/div/div/div/div/div[1]/button'
+PRIME_PICKS_BUTTON = "xpath=//button[contains(@class, 'v-btn') and span[text()[normalize-space()='Prime Picks']]]"
+BROKER_PICKS_SPAN = 'xpath=//span[normalize-space(text())="Broker Picks"]'
+
+# A row counts as data once it has a non-empty cell that is not the "No data" placeholder.
+HAS_DATA_ROWS_JS = """
+() => [...document.querySelectorAll('table tbody tr')].some(tr =>
+    [...tr.querySelectorAll('td')].some(td =>
+        td.innerText.trim() !== '' && !td.className.includes('empty')))
+"""
+
+# Pulls headers and every row in one round trip instead of one find_elements call per cell.
+EXTRACT_TABLE_JS = """
+() => {
+    const table = [...document.querySelectorAll('table')].find(t => t.querySelector('tbody td'));
+    if (!table) return {headers: [], rows: []};
+    const text = cell => cell.innerText.trim();
+    const headers = [...table.querySelectorAll('thead th')].map(text);
+    const rows = [...table.querySelectorAll('tbody tr')]
+        .map(tr => [...tr.querySelectorAll('td')]
+            .filter(td => !td.className.includes('empty'))
+            .map(text))
+        .filter(cells => cells.some(cell => cell !== ''));
+    return {headers, rows};
+}
+"""
+
+
+async def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def click(page, selector):
+    """Dispatches a DOM click once the element is attached, like the JS clicks in the Selenium flow."""
+    locator = page.locator(selector).first
+    await locator.wait_for(state="attached", timeout=timeout_ms)
+    await locator.scroll_into_view_if_needed()
+    await locator.dispatch_event("click")
+
+
+async def open_broker_picks(page):
+    """Navigates the chart page menus to the Broker Picks table, unless it is already rendered."""
+    if await page.evaluate(HAS_DATA_ROWS_JS):
+        return
+    await click(page, FIRST_BUTTON)
+    print("✅ First button clicked")
+    await click(page, PRIME_PICKS_BUTTON)
+    print("✅ 'Prime Picks' button clicked")
+    await click(page, BROKER_PICKS_SPAN)
+    print("✅ 'Broker Picks' span clicked")
+    await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+
+
+async def scrape_broker_picks(url=URL, save_html=None):
+    """Returns (headers, rows) of the Broker Picks table at `url` (http(s) or a saved file:// page)."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])
+        try:
+            context = await browser.new_context(user_agent=USER_AGENT)
+            await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined});")
+            await context.route("**/*", block_heavy_resources)
+            page = await context.new_page()
+
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            print("📄 Page loaded")
+            await open_broker_picks(page)
+
+            print("⏳ Waiting for data rows to appear...")
+            await page.wait_for_function(HAS_DATA_ROWS_JS, timeout=timeout_ms)
+            table = await page.evaluate(EXTRACT_TABLE_JS)
+
+            if save_html:
+                with open(save_html, "w", encoding="utf-8") as f:
+                    f.write(await page.content())
+                print(f"💾 Saved page snapshot to {save_html}")
+        finally:
+            await browser.close()
+
+    print(f"✅ Found {len(table['rows'])} data rows")
+    return table["headers"], table["rows"]
+
+
+def to_sheet_layout(headers, rows):
+    """Maps scraped headers and rows onto [BROKER_HEADER, Top 1..Top 5].
+
+    The first scraped column is taken as the broker column and "Top N" headers are matched
+    ignoring case and spacing; any other column is dropped. Raises ValueError when the
+    table does not have that shape, so a changed page never lands in Broker_Analysis.xlsx.
+    """
+    if not headers:
+        raise ValueError("Scraped table has no header row")
+    positions = {}
+    for i, header in enumerate(headers[1:], start=1):
+        match = re.fullmatch(r"top\s*(\d+)", header.strip(), flags=re.IGNORECASE)
+        if match:
+            positions.setdefault(f"Top {int(match.group(1))}", i)
+    missing = [h for h in TOP_HEADERS if h not in positions]
+    if missing:
+        raise ValueError(f"Scraped headers {headers} are missing {', '.join(missing)}")
+    if re.match(r"top\s*\d", headers[0].strip(), flags=re.IGNORECASE):
+        raise ValueError(f"Scraped headers {headers} have no broker column before the Top columns")
+
+    order = [0] + [positions[h] for h in TOP_HEADERS]
+    bad = [row for row in rows if len(row) <= max(order)]
+    if bad:
+        raise ValueError(f"{len(bad)} rows are missing Top cells, e.g. {bad[0]}")
+    return [BROKER_HEADER, *TOP_HEADERS], [[row[i] for i in order] for row in rows]
+
+
+def save_rows_to_workbook(headers, rows, output_path, sheet_name):
+    """Writes rows as a new first sheet so readers that take sheet_names[0] see the latest day."""
+    if os.path.exists(output_path):
+        wb = load_workbook(output_path)
+        if sheet_name in wb.sheetnames:
+            del wb[sheet_name]
+        ws = wb.create_sheet(title=sheet_name, index=0)
+    else:
+        wb = Workbook()
+        ws = wb.active
+        ws.title = sheet_name
+
+    if headers:
+        ws.append(headers)
+    for row in rows:
+        ws.append(row)
+    wb.active = 0
+    wb.save(output_path)
+    print(f"🎉 Done: {len(rows)} rows saved to sheet {sheet_name} of {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape NepseAlpha Broker Picks into Broker_Analysis.xlsx.")
+    parser.add_argument("--url", default=URL, help="Page to scrape; a saved snapshot can be passed as file:///path.html")
+    parser.add_argument("--output", default=output_path)
+    parser.add_argument("--sheet", default=datetime.today().strftime('%Y-%m-%d'))
+    parser.add_argument("--save-html", default=None, help="Also save the rendered page for offline re-runs")
+    args = parser.parse_args()
+
+    headers, rows = asyncio.run(scrape_broker_picks(args.url, args.save_html))
+    if not rows:
+        print("❌ No data rows found")
+        return
+    try:
+        headers, rows = to_sheet_layout(headers, rows)
+    except ValueError as e:
+        print(f"❌ Table layout changed, nothing saved: {e}")
+        return
+    save_rows_to_workbook(headers, rows, args.output, args.sheet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import sys
+from collections import deque
+import numpy as np
+import pandas as pd
+from sheet_index import get_sheet_index
+
+# --- CONFIG ---
+broker_path = "Broker_Analysis.xlsx"
+BROKER_DATE_FORMAT = "%Y-%m-%d"
+columns_to_use = ['Top 1', 'Top 2', 'Top 3']
+ranking_windows = [5, 20, 60]
+
+
+def count_top_companies(df, columns=columns_to_use):
+    """Counts company appearances across the Top columns of one sheet, like top_broker.py."""
+    entries = pd.concat([df[col] for col in columns if col in df.columns])
+    entries = entries[entries.astype(str).str.contains('/', regex=False)]
+    return entries.astype(str).str.split('/').str[0].str.strip().value_counts()
+
+
+class RollingBrokerRankings:
+    """Per-company frequency counts over rolling windows of Broker_Analysis sheets.
+
+    Each new sheet's counts are added to every window total and the counts of the
+    sheet falling out of the window are subtracted, so a day costs O(companies) no
+    matter how long the windows are.
+    """
+
+    def __init__(self, windows=ranking_windows):
+        self.windows = sorted(windows)
+        self.companies = []
+        self.codes = {}
+        self.days = deque(maxlen=self.windows[-1] + 1)
+        self.totals = {w: np.zeros(0, dtype=np.int64) for w in self.windows}
+        self.previous_totals = {w: np.zeros(0, dtype=np.int64) for w in self.windows}
+
+    @property
+    def last_date(self):
+        return self.days[-1][0] if self.days else None
+
+    def _vector(self, counts):
+        for company in counts.index:
+            if company not in self.codes:
+                self.codes[company] = len(self.companies)
+                self.companies.append(company)
+        vector = np.zeros(len(self.companies), dtype=np.int64)
+        vector[[self.codes[c] for c in counts.index]] = counts.to_numpy()
+        for w in self.windows:
+            self.totals[w] = np.pad(self.totals[w], (0, len(vector) - len(self.totals[w])))
+        return vector
+
+    def add_day(self, date, counts):
+        """Adds one sheet's company counts (a Series indexed by company)."""
+        vector = self._vector(counts)
+        self.days.append((date, vector))
+        for w in self.windows:
+            self.previous_totals[w] = self.totals[w].copy()
+            self.totals[w] += vector
+            if len(self.days) > w:
+                expired = self.days[-w - 1][1]
+                self.totals[w][:len(expired)] -= expired
+
+    def ranking(self, window):
+        """Companies ranked by count in the window, with yesterday's rank and the change."""
+        count = pd.Series(self.totals[window], index=self.companies, name="Count")
+        previous = pd.Series(np.pad(self.previous_totals[window], (0, len(count) - len(self.previous_totals[window]))),
+                             index=self.companies)
+        rank = count.rank(ascending=False, method="min").astype(int)
+        prev_rank = previous.rank(ascending=False, method="min").astype(int).where(previous > 0).astype("Int64")
+        result = pd.DataFrame({"Count": count, "Rank": rank, "Prev Rank": prev_rank})
+        result["Change"] = result["Prev Rank"] - result["Rank"]
+        result.index.name = "Company"
+        return result[result["Count"] > 0].sort_values(["Rank", "Count"], ascending=[True, False])
+
+    def movers(self, window, top=10):
+        """Biggest rank gains and losses in the window since the previous sheet."""
+        ranked = self.ranking(window).dropna(subset=["Change"])
+        ranked = ranked[ranked["Change"] != 0]
+        return ranked.sort_values("Change", ascending=False).head(top), ranked.sort_values("Change").head(top)
+
+    @classmethod
+    def from_excel(cls, broker_path=broker_path, windows=ranking_windows, columns=columns_to_use):
+        rankings = cls(windows)
+        rankings.update(broker_path, columns)
+        return rankings
+
+    def update(self, broker_path=broker_path, columns=columns_to_use):
+        """Adds every sheet dated after the last one processed, oldest first."""
+        index = get_sheet_index(broker_path, BROKER_DATE_FORMAT)
+        start = None if self.last_date is None else self.last_date + pd.Timedelta(days=1)
+        added = 0
+        for date, df in index.read_range(start=start, usecols=columns):
+            self.add_day(date, count_top_companies(df, columns))
+            added += 1
+        return added
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else broker_path
+    rankings = RollingBrokerRankings.from_excel(path)
+    print(f"📅 {len(rankings.days)} sheets up to {rankings.last_date:%Y-%m-%d}")
+    for w in rankings.windows:
+        print(f"\n🏆 Top 10 companies in ({', '.join(columns_to_use)}) over the last {w} sheets:")
+        print(rankings.ranking(w).head(10).to_string())
+        gainers, losers = rankings.movers(w, top=5)
+        if not gainers.empty:
+            print(f"⬆️ Risers: {', '.join(f'{c} ({int(r.Change):+})' for c, r in gainers.iterrows())}")
+        if not losers.empty:
+            print(f"⬇️ Fallers: {', '.join(f'{c} ({int(r.Change):+})' for c, r in losers.iterrows())}")
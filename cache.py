@@ -0,0 +1,174 @@
+import functools
+import hashlib
+import importlib.util
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+
+# --- CONFIG ---
+CACHE_DIR = os.environ.get("NEPSE_CACHE_DIR", os.path.join(".cache", "nepse"))
+MAX_CACHE_BYTES = int(float(os.environ.get("NEPSE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+ENABLED = os.environ.get("NEPSE_CACHE", "1") != "0"
+CACHE_VERSION = 1  # bump to drop every entry, e.g. when a cached result changes shape
+
+_file_hashes = {}
+
+
+def file_hash(path):
+    """Content hash of an input file, computed once per (size, mtime) version in this process."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def _module_file(module):
+    path = getattr(module, "__file__", None)
+    return os.path.abspath(path) if path else None
+
+
+def _local_module_files(module, root, files):
+    """Adds the source file of `module` and, recursively, of every module in `root` it
+    imports or takes functions/classes from."""
+    path = _module_file(module)
+    if path is None or path in files or os.path.dirname(path) != root:
+        return
+    files.add(path)
+    for value in list(vars(module).values()):
+        if inspect.ismodule(value):
+            dependency = value
+        elif inspect.isfunction(value) or inspect.isclass(value):
+            dependency = sys.modules.get(value.__module__)
+        else:
+            continue
+        if dependency is not None:
+            _local_module_files(dependency, root, files)
+
+
+def _code_hash(func, modules=()):
+    """Hash of the source of func's module and every repo module it depends on, so editing
+    a helper or a class that ends up in the result invalidates the cached entries.
+
+    Modules imported inside function bodies are not seen; name them in `modules`.
+    """
+    module = sys.modules[func.__module__]
+    root = os.path.dirname(_module_file(module) or os.path.abspath(inspect.getfile(func)))
+    files = set()
+    _local_module_files(module, root, files)
+    for name in modules:
+        if name in sys.modules:
+            _local_module_files(sys.modules[name], root, files)
+        else:
+            spec = importlib.util.find_spec(name)
+            if spec is not None and spec.origin:
+                files.add(os.path.abspath(spec.origin))
+    files.add(os.path.abspath(inspect.getfile(func)))
+
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(p for p in files if os.path.isfile(p)):
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.pkl")
+
+
+def get(key):
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+        os.utime(path)  # mark as recently used for LRU eviction
+    except Exception:
+        # missing, truncated, evicted meanwhile, or pickled from classes that have since changed
+        return None, False
+    return value, True
+
+
+def put(key, value):
+    path = _entry_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    evict()
+
+
+def evict(max_bytes=None):
+    """Deletes least recently used entries until the cache fits in max_bytes."""
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if name.endswith(".pkl"):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:  # removed by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def clear():
+    evict(max_bytes=0)
+
+
+def memoize(file_args=(), depends=None, modules=()):
+    """Caches a function's return value on disk.
+
+    The key is CACHE_VERSION, the source of the function's module and the repo modules
+    it uses (plus any named in `modules`), its bound arguments, the content hash of every
+    argument named in `file_args` (so a new workbook invalidates old results), and
+    whatever `depends()` returns for module-level settings it reads, including those
+    of other modules.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        code_hash = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal code_hash
+            if not ENABLED:
+                return func(*args, **kwargs)
+            if code_hash is None:  # on first call, once every module it uses is imported
+                code_hash = _code_hash(func, modules)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            for name in file_args:
+                if params.get(name) is not None:
+                    params[name] = ("file", file_hash(params[name]))
+            material = repr((CACHE_VERSION, func.__module__, func.__qualname__, code_hash, sorted(params.items()),
+                             depends() if depends else None))
+            key = hashlib.blake2b(material.encode(), digest_size=20).hexdigest()
+
+            value, hit = get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            put(key, value)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
@@ -0,0 +1,120 @@
+import sys
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.spatial.distance import squareform
+from golden_cross import load_close_history
+from market_data import normalize_symbol
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+correlation_window = 60
+min_periods = 20
+cluster_threshold = 0.8  # correlation distance sqrt(2 * (1 - corr)) at which clusters are cut
+max_cached = 32
+
+
+def build_return_matrix(history):
+    """Date x symbol daily returns from the deduplicated Symbol/Date/Close history.
+
+    A symbol has a return only on dates where it has a (changed) close, measured against
+    its previous close; dates it did not trade stay NaN instead of becoming a 0% return.
+    """
+    history = history.assign(Symbol=history['Symbol'].map(normalize_symbol))
+    closes = history.pivot_table(index='Date', columns='Symbol', values='Close', aggfunc='last').sort_index()
+    previous = closes.ffill().shift(1)
+    returns = closes / previous - 1
+    return returns.astype(np.float64)
+
+
+def nan_correlation(returns, min_periods=min_periods):
+    """Pairwise Pearson correlation of the columns of `returns`, each pair using only the rows
+    where both are present. Done as a handful of BLAS matrix products instead of a pair loop."""
+    mask = ~np.isnan(returns)
+    x = np.where(mask, returns, 0.0)
+    m = mask.astype(np.float64)
+
+    n = m.T @ m
+    sum_x = x.T @ m          # sum of x_i over rows where j is also present
+    sum_xx = (x * x).T @ m
+    sum_xy = x.T @ x
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_i = sum_xx - sum_x ** 2 / n
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[n < min_periods] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr
+
+
+class CorrelationEngine:
+    """Rolling correlation matrices over a return matrix, cached per (end date, window)."""
+
+    def __init__(self, returns, max_cached=max_cached):
+        self.returns = returns
+        self.values = returns.to_numpy()
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_excel(cls, excel_path, lookback_days=None):
+        return cls(build_return_matrix(load_close_history(excel_path, lookback_days)))
+
+    def matrix(self, end=None, window=correlation_window):
+        """Correlation matrix of the `window` trading days ending at `end` (default: latest)."""
+        stop = len(self.returns) if end is None else int(self.returns.index.searchsorted(pd.Timestamp(end), side="right"))
+        key = (stop, window)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        values = self.values[max(stop - window, 0):stop]
+        listed = (~np.isnan(values)).sum(axis=0) >= min_periods
+        corr = nan_correlation(values[:, listed])
+        symbols = self.returns.columns[listed]
+        result = pd.DataFrame(corr, index=symbols, columns=symbols)
+
+        self._cache[key] = result
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return result
+
+    def rolling(self, window=correlation_window, step=5):
+        """Yields (date, matrix) every `step` trading days once a full window is available."""
+        for stop in range(window, len(self.returns) + 1, step):
+            yield self.returns.index[stop - 1], self.matrix(self.returns.index[stop - 1], window)
+
+    def most_correlated(self, symbol, end=None, window=correlation_window, top=10):
+        corr = self.matrix(end, window)
+        symbol = normalize_symbol(symbol)
+        return corr[symbol].drop(symbol).dropna().sort_values(ascending=False).head(top)
+
+
+def cluster_symbols(corr, threshold=cluster_threshold):
+    """Average-linkage clusters on the correlation distance sqrt(2 * (1 - corr)).
+
+    Symbols whose correlation with the rest is undefined are left out.
+    """
+    corr = corr.dropna(how="all").dropna(axis=1, how="all")
+    keep = corr.notna().all(axis=0)
+    corr = corr.loc[keep, keep]
+    if len(corr) < 2:
+        return pd.Series(1, index=corr.index, name="Cluster")
+    distance = np.sqrt(np.clip(2 * (1 - corr.to_numpy()), 0, None))
+    np.fill_diagonal(distance, 0)
+    tree = linkage(squareform(distance, checks=False), method="average")
+    return pd.Series(fcluster(tree, t=threshold, criterion="distance"), index=corr.index, name="Cluster")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else excel_path
+    print(f"📊 Loading {path}...")
+    engine = CorrelationEngine.from_excel(path)
+    corr = engine.matrix()
+    clusters = cluster_symbols(corr)
+    print(f"🔗 {correlation_window}-day correlation over {len(corr)} symbols up to {engine.returns.index[-1].date()}")
+    for cluster_id, members in clusters.groupby(clusters):
+        if len(members) > 1:
+            print(f" - Cluster {cluster_id}: {', '.join(members.index)}")
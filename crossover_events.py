@@ -0,0 +1,305 @@
+import hashlib
+import os
+import sys
+import numpy as np
+import pandas as pd
+from golden_cross import windows
+from market_data import SymbolTable, load_market_data, normalize_symbol
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+index_path = os.path.join(".cache", "crossover_events.npz")
+slingshot_spans = (38, 62)
+
+EVENT_KINDS = ["GoldenCross", "DeathCross", "TrendUp", "TrendDown"]
+GOLDEN, DEATH, TREND_UP, TREND_DOWN = range(len(EVENT_KINDS))
+NO_TREND = 2  # sentinel for "no previous trend yet"; real trends are -1, 0, 1
+
+
+class CrossoverIndex:
+    """Date-sorted table of golden/death crosses for every SMA window pair and slingshot
+    EMA trend flips, with per-symbol state so new days can be appended incrementally.
+
+    Like golden_cross, unchanged closes (non-trading days) are dropped before the SMAs
+    are computed; the EMAs run over every row of a symbol, as slingshot's do, so trend
+    flips land on the same dates as slingshot.py's chart markers.
+    """
+
+    __slots__ = ("pairs", "spans", "symbols", "last_date", "fingerprint",
+                 "tail", "last_close", "ema", "trend",
+                 "event_date", "event_symbol", "event_kind", "event_pair",
+                 "symbol_order", "symbol_offsets")
+
+    def __init__(self, pairs=None, spans=slingshot_spans):
+        self.pairs = np.array(pairs if pairs is not None else list(windows.values()), dtype=np.int32).reshape(-1, 2)
+        self.spans = np.array(spans, dtype=np.int32)
+        self.symbols = SymbolTable()
+        self.last_date = None
+        self.fingerprint = ""
+        history = int(self.pairs.max()) if len(self.pairs) else 1
+        self.tail = np.empty((history, 0), dtype=np.float64)
+        self.last_close = np.empty(0, dtype=np.float64)
+        self.ema = np.empty((2, 0), dtype=np.float64)
+        self.trend = np.empty(0, dtype=np.int8)
+        self.event_date = np.empty(0, dtype="datetime64[D]")
+        self.event_symbol = np.empty(0, dtype=np.int32)
+        self.event_kind = np.empty(0, dtype=np.int8)
+        self.event_pair = np.empty(0, dtype=np.int8)
+        self._build_symbol_index()
+
+    def __len__(self):
+        return len(self.event_date)
+
+    # --- building ---
+
+    def _grow(self, n_symbols):
+        extra = n_symbols - len(self.last_close)
+        if extra <= 0:
+            return
+        self.tail = np.hstack([self.tail, np.full((self.tail.shape[0], extra), np.nan)])
+        self.last_close = np.concatenate([self.last_close, np.full(extra, np.nan)])
+        self.ema = np.hstack([self.ema, np.full((2, extra), np.nan)])
+        self.trend = np.concatenate([self.trend, np.full(extra, NO_TREND, dtype=np.int8)])
+
+    def update(self, data):
+        """Appends events for the MarketData rows dated after the last processed day.
+
+        `data` should hold the workbook from its first day: the fingerprint saved with
+        the index covers every row up to last_date, so update_index can tell when days
+        that were already indexed have changed.
+        """
+        new = data if self.last_date is None else data.between(self.last_date + np.timedelta64(1, "D"))
+        if len(new) == 0:
+            return 0
+        remap = np.array([self.symbols.code(name) for name in new.symbols.names], dtype=np.int32)
+        self._grow(len(self.symbols))
+        before = len(self)
+
+        # SMA crosses skip unchanged closes (non-trading days), like golden_cross
+        trading = new.drop_unchanged_closes()
+        codes = remap[trading.symbol_code]
+        keep = trading.close.astype(np.float64) != self.last_close[codes]
+        keep[1:] |= trading.symbol_code[1:] == trading.symbol_code[:-1]  # only the first new row per symbol can repeat the stored close
+        rows = np.flatnonzero(keep)
+        if len(rows):
+            closes = trading.close[rows].astype(np.float64)
+            new_closes, new_dates, last_rows = self._position_matrix(
+                codes[rows], closes, trading.calendar[trading.date_index[rows]])
+            self._append_sma_events(new_closes, new_dates)
+            self.tail = _shift_in(self.tail, new_closes)
+            self.last_close[codes[rows][last_rows]] = closes[last_rows]
+
+        # EMA trend flips use every row with a full OHLC, like slingshot.calculate_sling_shot
+        rows = np.flatnonzero(~(np.isnan(new.open) | np.isnan(new.high) | np.isnan(new.low)))
+        if len(rows):
+            new_closes, new_dates, _ = self._position_matrix(
+                remap[new.symbol_code[rows]], new.close[rows].astype(np.float64), new.calendar[new.date_index[rows]])
+            self._append_trend_events(new_closes, new_dates)
+
+        self._sort_events()
+        dates = new.calendar[new.date_index]
+        self.last_date = dates.max() if self.last_date is None else max(self.last_date, dates.max())
+        self.fingerprint = data_fingerprint(data, self.last_date)
+        return len(self) - before
+
+    def _position_matrix(self, codes, closes, dates):
+        """Position x symbol matrices of closes and dates (row i is each symbol's i-th new row)
+        for rows grouped by symbol, plus the index of each symbol's last row."""
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        run_lengths = np.diff(np.r_[starts, len(codes)])
+        positions = np.arange(len(codes)) - np.repeat(starts, run_lengths)
+        n_new = int(positions.max()) + 1
+        new_closes = np.full((n_new, len(self.symbols)), np.nan)
+        new_dates = np.full((n_new, len(self.symbols)), np.datetime64("NaT"), dtype="datetime64[D]")
+        new_closes[positions, codes] = closes
+        new_dates[positions, codes] = dates
+        return new_closes, new_dates, np.r_[starts[1:], len(codes)] - 1
+
+    def matches(self, data):
+        """True if `data` holds exactly the rows this index was built from, up to last_date."""
+        return self.last_date is None or self.fingerprint == data_fingerprint(data, self.last_date)
+
+    def _append_sma_events(self, new_closes, new_dates):
+        combined = pd.DataFrame(np.vstack([self.tail, new_closes]))
+        history = self.tail.shape[0]
+        for pair_idx, (short_window, long_window) in enumerate(self.pairs):
+            short = combined.rolling(window=int(short_window), min_periods=int(short_window)).mean().to_numpy()
+            long = combined.rolling(window=int(long_window), min_periods=int(long_window)).mean().to_numpy()
+            above = short[history:] > long[history:]
+            below = short[history:] < long[history:]
+            was_at_or_below = short[history - 1:-1] <= long[history - 1:-1]
+            was_at_or_above = short[history - 1:-1] >= long[history - 1:-1]
+            self._append(new_dates, above & was_at_or_below, GOLDEN, pair_idx)
+            self._append(new_dates, below & was_at_or_above, DEATH, pair_idx)
+
+    def _append_trend_events(self, new_closes, new_dates):
+        alphas = 2.0 / (self.spans.astype(np.float64) + 1.0)
+        trends = np.empty(new_closes.shape, dtype=np.int8)
+        ema = self.ema.copy()
+        trend = self.trend.copy()
+        for i, row in enumerate(new_closes):
+            valid = ~np.isnan(row)
+            for j, alpha in enumerate(alphas):
+                seeded = np.isnan(ema[j])
+                ema[j] = np.where(valid & seeded, row, ema[j])
+                ema[j] = np.where(valid & ~seeded, alpha * row + (1 - alpha) * ema[j], ema[j])
+            trend = np.where(valid, np.sign(np.nan_to_num(ema[0] - ema[1])).astype(np.int8), trend)
+            trends[i] = np.where(valid, trend, NO_TREND)
+
+        # new rows are contiguous from position 0, so the row above is always the previous day
+        previous = np.vstack([self.trend[np.newaxis, :], trends[:-1]])
+        self._append(new_dates, (trends == 1) & (previous != 1) & (previous != NO_TREND), TREND_UP, -1)
+        self._append(new_dates, (trends == -1) & (previous != -1) & (previous != NO_TREND), TREND_DOWN, -1)
+        self.ema = ema
+        self.trend = trend
+
+    def _append(self, new_dates, mask, kind, pair_idx):
+        positions, codes = np.nonzero(mask)
+        self.event_date = np.concatenate([self.event_date, new_dates[positions, codes]])
+        self.event_symbol = np.concatenate([self.event_symbol, codes.astype(np.int32)])
+        self.event_kind = np.concatenate([self.event_kind, np.full(len(codes), kind, dtype=np.int8)])
+        self.event_pair = np.concatenate([self.event_pair, np.full(len(codes), pair_idx, dtype=np.int8)])
+
+    def _sort_events(self):
+        order = np.lexsort((self.event_pair, self.event_kind, self.event_symbol, self.event_date))
+        self.event_date = self.event_date[order]
+        self.event_symbol = self.event_symbol[order]
+        self.event_kind = self.event_kind[order]
+        self.event_pair = self.event_pair[order]
+        self._build_symbol_index()
+
+    def _build_symbol_index(self):
+        self.symbol_order = np.lexsort((self.event_date, self.event_symbol))
+        self.symbol_offsets = np.searchsorted(self.event_symbol[self.symbol_order], np.arange(len(self.symbols) + 1))
+
+    # --- queries ---
+
+    def between(self, start=None, end=None, kind=None, symbol=None):
+        """Events with start <= date <= end, optionally filtered by kind name or symbol."""
+        lo = 0 if start is None else np.searchsorted(self.event_date, np.datetime64(start, "D"), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.event_date, np.datetime64(end, "D"), side="right")
+        rows = np.arange(lo, hi)
+        if kind is not None:
+            rows = rows[self.event_kind[rows] == EVENT_KINDS.index(kind)]
+        if symbol is not None:
+            code = self.symbols.codes.get(normalize_symbol(symbol), -1)
+            rows = rows[self.event_symbol[rows] == code]
+        return self._frame(rows)
+
+    def last_event(self, symbol, kind=None):
+        """Most recent event for `symbol` (optionally of one kind) as a dict, or None."""
+        code = self.symbols.codes.get(normalize_symbol(symbol))
+        if code is None:
+            return None
+        rows = self.symbol_order[self.symbol_offsets[code]:self.symbol_offsets[code + 1]]
+        if kind is not None:
+            rows = rows[self.event_kind[rows] == EVENT_KINDS.index(kind)]
+        if len(rows) == 0:
+            return None
+        return self._frame(rows[-1:]).iloc[0].to_dict()
+
+    def _frame(self, rows):
+        labels = [f"SMA{s}-SMA{l}" for s, l in self.pairs] + [f"EMA{self.spans[0]}-EMA{self.spans[1]}"]
+        return pd.DataFrame({
+            "Date": self.event_date[rows],
+            "Symbol": np.asarray(self.symbols.names, dtype=object)[self.event_symbol[rows]],
+            "Event": np.asarray(EVENT_KINDS, dtype=object)[self.event_kind[rows]],
+            "Window": np.asarray(labels, dtype=object)[self.event_pair[rows]],
+        })
+
+    # --- persistence ---
+
+    def built_with(self, pairs, spans):
+        """True if the index was built for exactly these SMA window pairs and EMA spans."""
+        pairs = np.array(pairs, dtype=np.int32).reshape(-1, 2)
+        return np.array_equal(self.pairs, pairs) and np.array_equal(self.spans, np.array(spans, dtype=np.int32))
+
+    def save(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            pairs=self.pairs, spans=self.spans, names=np.array(self.symbols.names, dtype=str),
+            last_date=np.array([self.last_date if self.last_date is not None else np.datetime64("NaT")], dtype="datetime64[D]"),
+            fingerprint=np.array(self.fingerprint),
+            tail=self.tail, last_close=self.last_close, ema=self.ema, trend=self.trend,
+            event_date=self.event_date, event_symbol=self.event_symbol,
+            event_kind=self.event_kind, event_pair=self.event_pair,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as saved:
+            index = cls(saved["pairs"], saved["spans"])
+            index.symbols = SymbolTable(saved["names"].tolist())
+            last_date = saved["last_date"][0]
+            index.last_date = None if np.isnat(last_date) else last_date
+            index.fingerprint = str(saved["fingerprint"]) if "fingerprint" in saved else ""
+            for field in ("tail", "last_close", "ema", "trend", "event_date", "event_symbol", "event_kind", "event_pair"):
+                setattr(index, field, saved[field])
+        index._build_symbol_index()
+        return index
+
+
+def _shift_in(tail, new_closes):
+    """Keeps the last tail.shape[0] closes of each symbol after appending its new closes."""
+    combined = np.vstack([tail, new_closes])
+    # push each column's trailing NaN padding to the top so its latest closes are last
+    valid = ~np.isnan(combined)
+    order = np.argsort(valid, axis=0, kind="stable")
+    packed = np.take_along_axis(combined, order, axis=0)
+    return packed[-tail.shape[0]:]
+
+
+def data_fingerprint(data, through):
+    """Hash of every row's symbol, date and prices up to `through`, independent of the
+    sheet order and of symbols that only appear later."""
+    rows = data.between(end=through)
+    used = np.unique(rows.symbol_code)
+    names = np.asarray(rows.symbols.names, dtype=object)[used]
+    order = np.argsort(names)
+    rank = np.zeros(len(rows.symbols), dtype=np.int32)
+    rank[used[order]] = np.arange(len(used), dtype=np.int32)
+    symbol_rank = rank[rows.symbol_code]
+    dates = rows.calendar[rows.date_index].astype("datetime64[D]").astype(np.int64)
+    sort = np.lexsort((dates, symbol_rank))
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\n".join(names[order]).encode())
+    for values in (symbol_rank, dates, rows.open, rows.high, rows.low, rows.close):
+        digest.update(np.ascontiguousarray(values[sort]).tobytes())
+    return digest.hexdigest()
+
+
+def load_index(index_path, pairs=None, spans=slingshot_spans):
+    """Loads the persisted index, or starts an empty one when there is none or it was built
+    for other window pairs/spans (e.g. after golden_cross.windows changed)."""
+    pairs = list(windows.values()) if pairs is None else pairs
+    if os.path.exists(index_path):
+        index = CrossoverIndex.load(index_path)
+        if index.built_with(pairs, spans):
+            return index
+        print(f"⚠️ {index_path} was built for other windows, rebuilding")
+    return CrossoverIndex(pairs, spans)
+
+
+def update_index(excel_path, index_path, pairs=None, data=None):
+    """Loads the persisted index (or starts one), appends any new days of `data` (default:
+    the whole workbook) and saves it back. The index is rebuilt when the days it already
+    covers have changed, e.g. a re-downloaded workbook with corrected or backfilled sheets."""
+    data = load_market_data(excel_path) if data is None else data
+    index = load_index(index_path, pairs)
+    if not index.matches(data):
+        print(f"⚠️ {index_path} was built from other data up to {index.last_date}, rebuilding")
+        index = CrossoverIndex(index.pairs, index.spans)
+    added = index.update(data)
+    index.save(index_path)
+    print(f"✅ {added} new events, {len(index)} total, up to {index.last_date}")
+    return index
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else excel_path
+    index = update_index(path, index_path)
+    if index.last_date is not None:
+        print(index.between(index.last_date - np.timedelta64(10, "D"), index.last_date).to_string(index=False))
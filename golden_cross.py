@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
-from openpyxl import load_workbook
 from concurrent.futures import ThreadPoolExecutor
 import sending_email
+from sheet_index import get_sheet_index
+from market_data import to_numeric
+import volume
+from volume import add_volume_indicators, volume_note
+from cache import memoize
 
 sending_mail=True
 recent_window=7
@@ -18,37 +22,49 @@ windows = {
 # --- CONFIG ---
 excel_path = "combined_excel.xlsx"
 
-def detect_golden_cross(excel_path, short_window, long_window, recent_window=7):
-    if long_window >= 20 and long_window<50:
-        lookback_days = long_window + 30
-    elif long_window >= 50 and long_window<200:
-        lookback_days = long_window + 50
-    else:
-        lookback_days = long_window + 100
-
-    wb = load_workbook(excel_path, read_only=True)
-    sheet_names = wb.sheetnames
-    selected_sheets = sheet_names[:lookback_days]
-
-    def read_sheet(sheet_name):
-        try:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name, usecols=["Symbol", "Close"], engine="openpyxl")
-            df.columns = df.columns.str.strip()
-            df['Date'] = pd.to_datetime(sheet_name, format="%Y_%m_%d")
-            df['Close'] = pd.to_numeric(df['Close'], errors='coerce')
-            return df.dropna(subset=['Symbol', 'Close'])
-        except Exception as e:
-            print(f"⚠️ Skipping {sheet_name}: {e}")
-            return pd.DataFrame()
+def read_close_sheet(index, entry):
+    try:
+        df = index.read(entry, usecols=["Symbol", "Close", "Vol"])
+        df['Date'] = pd.Timestamp(entry.date)
+        df['Close'] = pd.to_numeric(df['Close'], errors='coerce')
+        if 'Vol' in df.columns:
+            df['Vol'] = to_numeric(df['Vol'])
+        return df.dropna(subset=['Symbol', 'Close'])
+    except Exception as e:
+        print(f"⚠️ Skipping {entry.name}: {e}")
+        return pd.DataFrame()
+
+@memoize(file_args=("excel_path",))
+def load_close_history(excel_path, lookback_days=None, start=None, end=None):
+    """Loads Symbol/Date/Close rows for the most recent (or start..end) sheets, dropping unchanged (non-trading) closes."""
+    index = get_sheet_index(excel_path)
+    selected_sheets = index.select(start, end, last=lookback_days)
 
     with ThreadPoolExecutor() as executor:
-        dfs = list(executor.map(read_sheet, selected_sheets))
+        dfs = list(executor.map(lambda entry: read_close_sheet(index, entry), selected_sheets))
 
     combined_df = pd.concat(dfs, ignore_index=True)
     combined_df.sort_values(['Symbol', 'Date'], inplace=True)
     combined_df['Prev_Close'] = combined_df.groupby('Symbol')['Close'].shift(1)
     combined_df = combined_df[(combined_df['Close'] != combined_df['Prev_Close']) | (combined_df['Prev_Close'].isna())]
     combined_df.drop(columns=['Prev_Close'], inplace=True)
+    return combined_df
+
+@memoize(file_args=("excel_path",),
+         depends=lambda: (volume.volume_ma_windows, volume.relative_volume_window,
+                          volume.vwap_window, volume.volume_confirm_ratio))
+def find_golden_crosses(excel_path, short_window, long_window, recent_window=7):
+    """Returns the golden crosses in the last `recent_window` unique dates and the latest date."""
+    if long_window >= 20 and long_window<50:
+        lookback_days = long_window + 30
+    elif long_window >= 50 and long_window<200:
+        lookback_days = long_window + 50
+    else:
+        lookback_days = long_window + 100
+
+    combined_df = load_close_history(excel_path, lookback_days)
+    if 'Vol' in combined_df.columns:
+        combined_df = add_volume_indicators(combined_df)
 
     start_date = combined_df['Date'].min().date()
     end_date = combined_df['Date'].max().date()
@@ -76,9 +92,13 @@ def detect_golden_cross(excel_path, short_window, long_window, recent_window=7):
     recent_crosses = processed[
         (processed['Date'].isin(recent_unique_dates)) & (processed['GoldenCross'])
     ]
+    return recent_crosses, recent_unique_dates.max()
+
+def detect_golden_cross(excel_path, short_window, long_window, recent_window=7):
+    recent_crosses, latest_date = find_golden_crosses(excel_path, short_window, long_window, recent_window)
 
     global email_body
-    output=f"\n🟡 [{short_window}-{long_window}] Golden Cross detected in last {recent_window} trading days (up to {recent_unique_dates.max().date()}):"
+    output=f"\n🟡 [{short_window}-{long_window}] Golden Cross detected in last {recent_window} trading days (up to {latest_date.date()}):"
     print(output)
     email_body +=output
     
@@ -87,7 +107,7 @@ def detect_golden_cross(excel_path, short_window, long_window, recent_window=7):
     else:
         sorted_crosses = recent_crosses.sort_values('Date', ascending=False)
         for _, row in sorted_crosses.iterrows():
-            output=f" - {row['Symbol']}: {row['Date'].date()}"
+            output=f" - {row['Symbol']}: {row['Date'].date()} ({volume_note(row)})"
             print(output)
             email_body +="\n"+output
             
@@ -0,0 +1,253 @@
+import sys
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sheet_index import get_sheet_index
+from cache import memoize
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+VOLUME_COLUMN = "Vol"
+DATE_FORMAT = "%Y_%m_%d"
+
+
+class SymbolTable:
+    """Interns normalized symbols to dense int32 codes."""
+
+    __slots__ = ("codes", "names")
+
+    def __init__(self, names=()):
+        self.codes = {}
+        self.names = []
+        for name in names:
+            self.code(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize_symbol(name) in self.codes
+
+    def code(self, name):
+        name = normalize_symbol(name)
+        if name not in self.codes:
+            self.codes[name] = len(self.names)
+            self.names.append(name)
+        return self.codes[name]
+
+    def encode(self, values):
+        """Encodes raw symbol cells, normalizing each distinct value only once."""
+        raw_codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        lookup = np.array([self.code(u) for u in uniques] + [-1], dtype=np.int32)
+        return lookup[raw_codes]
+
+    def decode(self, codes):
+        names = np.asarray(self.names, dtype=object)
+        return names[np.asarray(codes)]
+
+
+def normalize_symbol(name):
+    return str(name).strip().upper()
+
+
+class SymbolHistory:
+    """Read-only view over one symbol's rows in a MarketData container."""
+
+    __slots__ = ("data", "symbol", "rows")
+
+    def __init__(self, data, symbol, rows):
+        self.data = data
+        self.symbol = symbol
+        self.rows = rows
+
+    def __len__(self):
+        return self.rows.stop - self.rows.start
+
+    @property
+    def date_index(self):
+        return self.data.date_index[self.rows]
+
+    @property
+    def dates(self):
+        return self.data.calendar[self.date_index]
+
+    @property
+    def open(self):
+        return self.data.open[self.rows]
+
+    @property
+    def high(self):
+        return self.data.high[self.rows]
+
+    @property
+    def low(self):
+        return self.data.low[self.rows]
+
+    @property
+    def close(self):
+        return self.data.close[self.rows]
+
+    @property
+    def volume(self):
+        return self.data.volume[self.rows]
+
+    def to_frame(self):
+        """Returns the Date/Open/High/Low/Close/Vol frame shape that slingshot works with."""
+        return pd.DataFrame({
+            "Symbol": self.symbol,
+            "Date": self.dates,
+            "Open": self.open,
+            "High": self.high,
+            "Low": self.low,
+            "Close": self.close,
+            "Vol": self.volume,
+        })
+
+
+class MarketData:
+    """Columnar OHLCV store: int32 symbol codes, uint16 indices into a trading calendar,
+    float32 prices and int64 volume, sorted by (symbol, date)."""
+
+    __slots__ = ("symbols", "calendar", "symbol_code", "date_index",
+                 "open", "high", "low", "close", "volume", "offsets")
+
+    def __init__(self, symbols, calendar, symbol_code, date_index, open, high, low, close, volume):
+        order = np.lexsort((date_index, symbol_code))
+        self.symbols = symbols
+        self.calendar = calendar
+        self.symbol_code = np.ascontiguousarray(symbol_code[order], dtype=np.int32)
+        self.date_index = np.ascontiguousarray(date_index[order], dtype=np.uint16)
+        self.open = np.ascontiguousarray(open[order], dtype=np.float32)
+        self.high = np.ascontiguousarray(high[order], dtype=np.float32)
+        self.low = np.ascontiguousarray(low[order], dtype=np.float32)
+        self.close = np.ascontiguousarray(close[order], dtype=np.float32)
+        self.volume = np.ascontiguousarray(volume[order], dtype=np.int64)
+        # offsets[c]:offsets[c + 1] are the rows of symbol code c
+        self.offsets = np.searchsorted(self.symbol_code, np.arange(len(symbols) + 1)).astype(np.int64)
+
+    def __len__(self):
+        return len(self.close)
+
+    @property
+    def nbytes(self):
+        arrays = (self.symbol_code, self.date_index, self.open, self.high, self.low,
+                  self.close, self.volume, self.offsets, self.calendar)
+        return sum(a.nbytes for a in arrays) + sum(sys.getsizeof(s) for s in self.symbols.names)
+
+    def symbol(self, name):
+        code = self.symbols.codes.get(normalize_symbol(name))
+        if code is None:
+            raise KeyError(f"No data found for symbol '{name}'")
+        return SymbolHistory(self, self.symbols.names[code], slice(self.offsets[code], self.offsets[code + 1]))
+
+    def __iter__(self):
+        for code, name in enumerate(self.symbols.names):
+            yield SymbolHistory(self, name, slice(self.offsets[code], self.offsets[code + 1]))
+
+    def take(self, mask):
+        return MarketData(self.symbols, self.calendar, self.symbol_code[mask], self.date_index[mask],
+                          self.open[mask], self.high[mask], self.low[mask], self.close[mask], self.volume[mask])
+
+    def drop_unchanged_closes(self):
+        """Drops rows whose close equals the symbol's previous close, as the golden_cross and
+        Momentum loaders do for non-trading days."""
+        keep = np.ones(len(self), dtype=bool)
+        keep[1:] = (self.close[1:] != self.close[:-1]) | (self.symbol_code[1:] != self.symbol_code[:-1])
+        return self.take(keep)
+
+    def between(self, start=None, end=None):
+        """Rows whose date lies in [start, end]."""
+        lo = 0 if start is None else np.searchsorted(self.calendar, np.datetime64(start, "D"), side="left")
+        hi = len(self.calendar) if end is None else np.searchsorted(self.calendar, np.datetime64(end, "D"), side="right")
+        return self.take((self.date_index >= lo) & (self.date_index < hi))
+
+    def to_matrix(self, field="close"):
+        """Dense calendar x symbol matrix of one field, NaN where a symbol has no row."""
+        matrix = np.full((len(self.calendar), len(self.symbols)), np.nan, dtype=np.float32 if field != "volume" else np.float64)
+        matrix[self.date_index, self.symbol_code] = getattr(self, field)
+        return matrix
+
+    def to_frame(self):
+        return pd.DataFrame({
+            "Symbol": pd.Categorical.from_codes(self.symbol_code, self.symbols.names),
+            "Date": self.calendar[self.date_index],
+            "Open": self.open,
+            "High": self.high,
+            "Low": self.low,
+            "Close": self.close,
+            "Vol": self.volume,
+        })
+
+
+def to_numeric(values):
+    if values.dtype == object:
+        values = values.astype(str).str.replace(',', '', regex=False)
+    return pd.to_numeric(values, errors='coerce')
+
+
+@memoize(file_args=("excel_path",))
+def load_market_data(excel_path, start=None, end=None):
+    """Loads every `%Y_%m_%d` sheet (or those dated start..end) into a MarketData container."""
+    index = get_sheet_index(excel_path, DATE_FORMAT)
+    sheets = index.read_range(start, end, usecols=["Symbol", VOLUME_COLUMN, *PRICE_COLUMNS])
+
+    symbols = SymbolTable()
+    calendar = np.array([date for date, _ in sheets], dtype="datetime64[D]")
+    parts = {key: [] for key in ("symbol", "date", "Open", "High", "Low", "Close", "Vol")}
+
+    for idx, (date, df) in enumerate(sheets):
+        if "Symbol" not in df.columns or "Close" not in df.columns:
+            continue
+        close = to_numeric(df["Close"]).to_numpy(dtype=np.float64)
+        codes = symbols.encode(df["Symbol"].to_numpy())
+        keep = (codes >= 0) & ~np.isnan(close)
+
+        parts["symbol"].append(codes[keep])
+        parts["date"].append(np.full(keep.sum(), idx, dtype=np.uint16))
+        for col in PRICE_COLUMNS:
+            values = to_numeric(df[col]).to_numpy(dtype=np.float64) if col in df.columns else close
+            parts[col].append(values[keep])
+        volume = to_numeric(df[VOLUME_COLUMN]).fillna(0).to_numpy(dtype=np.int64) if VOLUME_COLUMN in df.columns else np.zeros(len(df), dtype=np.int64)
+        parts["Vol"].append(volume[keep])
+
+    if not parts["symbol"]:
+        raise ValueError(f"No dated sheets with Symbol/Close found in {excel_path}")
+    columns = {key: np.concatenate(values) for key, values in parts.items()}
+    return MarketData(symbols, calendar, columns["symbol"], columns["date"],
+                      columns["Open"], columns["High"], columns["Low"], columns["Close"], columns["Vol"])
+
+
+def benchmark_memory(data):
+    """Compares the container with the object-string / Timestamp frame and the
+    Momentum-style dict of (datetime, float) tuples for the same rows."""
+    frame = data.to_frame()
+    frame["Symbol"] = frame["Symbol"].astype(str)
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+
+    tuples_bytes = 0
+    for history in data:
+        dates = history.dates.astype("datetime64[s]").astype(datetime)
+        closes = history.close.astype(float)
+        pairs = [(d, c) for d, c in zip(dates, closes)]
+        tuples_bytes += sys.getsizeof(pairs) + sum(sys.getsizeof(p) + sys.getsizeof(p[0]) + sys.getsizeof(p[1]) for p in pairs)
+
+    return {
+        "rows": len(data),
+        "symbols": len(data.symbols),
+        "trading_days": len(data.calendar),
+        "market_data_bytes": data.nbytes,
+        "pandas_object_frame_bytes": frame_bytes,
+        "tuple_history_bytes (Close only)": tuples_bytes,
+    }
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else excel_path
+    print(f"📊 Loading {path}...")
+    data = load_market_data(path)
+    report = benchmark_memory(data)
+    for key, value in report.items():
+        print(f"{key:<35} {value:>14,}")
+    print(f"🎉 MarketData uses {report['market_data_bytes'] / report['pandas_object_frame_bytes']:.1%} of the object frame's memory")
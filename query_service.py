@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import pandas as pd
+from Broker_holdings import compute_net_changes, count_companies, preprocess
+from crossover_events import EVENT_KINDS, index_path, update_index
+from market_data import load_market_data
+from screener import build_position_matrices, compute_returns
+from sheet_index import file_version, get_sheet_index
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+broker_path = "Broker_Analysis.xlsx"
+BROKER_DATE_FORMAT = "%Y-%m-%d"
+host = "127.0.0.1"
+port = 8765
+poll_interval = 5  # seconds between checks for a new workbook
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class QueryError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceState:
+    """Everything the service answers from, loaded once per workbook version.
+
+    Momentum as of the latest day is computed at load; other reference days are
+    computed on first request (off the event loop) and kept in `momentum`.
+    """
+
+    __slots__ = ("versions", "data", "history", "trading_days", "crossovers", "holdings", "momentum")
+
+    def __init__(self, versions, data, crossovers, holdings):
+        self.versions = versions
+        self.data = data
+        frame = data.drop_unchanged_closes().to_frame()
+        frame["Symbol"] = frame["Symbol"].astype(str)
+        self.history = frame
+        self.trading_days = np.sort(frame["Date"].unique())
+        self.crossovers = crossovers
+        self.holdings = holdings
+        # trading day -> returns table, or the executor future computing it
+        self.momentum = {}
+        if len(self.trading_days):
+            latest = self.trading_days[-1]
+            self.momentum[latest] = momentum_table(self.history, latest)
+
+    def reference_day(self, ref_date=None):
+        """Latest trading day on or before ref_date (default: the latest), or None."""
+        if ref_date is None:
+            return self.trading_days[-1] if len(self.trading_days) else None
+        pos = np.searchsorted(self.trading_days, np.datetime64(ref_date), side="right")
+        return self.trading_days[pos - 1] if pos else None
+
+
+def momentum_table(history, day):
+    """DAYS_MAP returns as fractions (like Momentum.py) for every symbol as of `day`."""
+    closes, _ = build_position_matrices(history[history["Date"] <= day])
+    table = compute_returns(closes.astype(float))
+    table.index.name = "Symbol"
+    return table.reset_index()
+
+
+def workbook_versions(excel_path, broker_path):
+    return tuple(file_version(p) if os.path.exists(p) else None for p in (excel_path, broker_path))
+
+
+def load_holdings(broker_path):
+    """Per-sheet company counts in the {"date", "companies"} shape Broker_holdings stores in MongoDB."""
+    if not os.path.exists(broker_path):
+        return []
+    index = get_sheet_index(broker_path, BROKER_DATE_FORMAT)
+    return [
+        {"date": date.strftime(BROKER_DATE_FORMAT), "companies": count_companies(preprocess(df)).to_dict()}
+        for date, df in index.read_range()
+    ]
+
+
+def load_state(excel_path, broker_path, index_path=index_path):
+    """Loads both workbooks; crossovers come from the persisted index, extended with any new
+    days, or rebuilt when the workbook's earlier sheets no longer match it."""
+    versions = workbook_versions(excel_path, broker_path)
+    data = load_market_data(excel_path)
+    crossovers = update_index(excel_path, index_path, data=data)
+    return ServiceState(versions, data, crossovers, load_holdings(broker_path))
+
+
+def to_records(df):
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def param(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def parse_date(value, name):
+    if value is None:
+        return None
+    for fmt in ("%Y-%m-%d", "%Y_%m_%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise QueryError(400, f"Invalid {name} '{value}', use YYYY-MM-DD")
+
+
+# --- handlers: each takes (state, query) and returns a JSON-serializable object;
+# handlers with work too slow for the event loop are coroutines that use the executor ---
+
+def symbol_history(state, query):
+    symbol = param(query, "symbol")
+    if not symbol:
+        raise QueryError(400, "symbol is required")
+    try:
+        df = state.data.symbol(symbol).to_frame()
+    except KeyError as e:
+        raise QueryError(404, str(e.args[0]))
+    start, end = parse_date(param(query, "start"), "start"), parse_date(param(query, "end"), "end")
+    if start is not None:
+        df = df[df["Date"] >= start]
+    if end is not None:
+        df = df[df["Date"] <= end]
+    # prices are stored as float32; round so 109.66 is not served as 109.6623001099
+    prices = {"Open": 2, "High": 2, "Low": 2, "Close": 2}
+    return to_records(df.astype(dict.fromkeys(prices, float)).round(prices))
+
+
+async def momentum(state, query):
+    """DAYS_MAP returns (as fractions, like Momentum.py) as of `date` (default: latest), for all or one symbol."""
+    day = state.reference_day(parse_date(param(query, "date"), "date"))
+    if day is None:
+        raise QueryError(404, "No data on or before the reference date")
+    table = state.momentum.get(day)
+    if table is None:
+        # pivoting the history takes a while, so do it off the loop; concurrent requests share the future
+        table = asyncio.get_running_loop().run_in_executor(None, momentum_table, state.history, day)
+        state.momentum[day] = table
+    if not isinstance(table, pd.DataFrame):
+        try:
+            table = await table
+        except Exception:
+            state.momentum.pop(day, None)
+            raise
+        state.momentum[day] = table
+    symbol = param(query, "symbol")
+    if symbol:
+        table = table[table["Symbol"] == symbol.strip().upper()]
+        if table.empty:
+            raise QueryError(404, f"No momentum for symbol '{symbol}'")
+    return to_records(table)
+
+
+def crossovers(state, query):
+    if param(query, "kind") not in (None, *EVENT_KINDS):
+        raise QueryError(400, f"kind must be one of {', '.join(EVENT_KINDS)}")
+    start, end = parse_date(param(query, "start"), "start"), parse_date(param(query, "end"), "end")
+    return to_records(state.crossovers.between(start, end, kind=param(query, "kind"), symbol=param(query, "symbol")))
+
+
+def last_crossover(state, query):
+    symbol = param(query, "symbol")
+    if not symbol:
+        raise QueryError(400, "symbol is required")
+    if param(query, "kind") not in (None, *EVENT_KINDS):
+        raise QueryError(400, f"kind must be one of {', '.join(EVENT_KINDS)}")
+    event = state.crossovers.last_event(symbol, kind=param(query, "kind"))
+    if event is None:
+        raise QueryError(404, f"No crossover for symbol '{symbol}'")
+    return to_records(pd.DataFrame([event]))[0]
+
+
+def holdings_changes(state, query):
+    """Net change in broker holdings between the oldest and latest of the last `n` sheets
+    (all sheets when n <= 0), with Broker_holdings.compute_net_changes' filter."""
+    try:
+        n = int(param(query, "n", 2))
+    except ValueError:
+        raise QueryError(400, "n must be an integer")
+    docs = state.holdings
+    if len(docs) < 2:
+        raise QueryError(404, f"Need at least 2 sheets to compare, found {len(docs)}")
+    docs = [docs[0], docs[-1]] if n <= 0 or n > len(docs) else docs[-n:]
+    return {"from": docs[0]["date"], "to": docs[-1]["date"], "changes": compute_net_changes(docs)}
+
+
+ROUTES = {
+    "/history": symbol_history,
+    "/momentum": momentum,
+    "/crossovers": crossovers,
+    "/crossovers/last": last_crossover,
+    "/holdings/changes": holdings_changes,
+}
+
+
+class QueryService:
+    """Asyncio HTTP/JSON server over an in-memory ServiceState that hot-reloads when
+    either workbook changes on disk."""
+
+    def __init__(self, excel_path=excel_path, broker_path=broker_path, poll_interval=poll_interval, index_path=index_path):
+        self.excel_path = excel_path
+        self.broker_path = broker_path
+        self.poll_interval = poll_interval
+        self.index_path = index_path
+        self.state = None
+        self.latencies = deque(maxlen=10000)
+        self.reloads = 0
+
+    async def reload(self):
+        loop = asyncio.get_running_loop()
+        # build off the event loop so queries keep being answered from the old state
+        self.state = await loop.run_in_executor(None, load_state, self.excel_path, self.broker_path, self.index_path)
+        self.reloads += 1
+        print(f"🔄 Loaded {len(self.state.data):,} rows, {len(self.state.crossovers):,} crossover events, "
+              f"{len(self.state.holdings)} holdings sheets")
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if workbook_versions(self.excel_path, self.broker_path) != self.state.versions:
+                    await self.reload()
+            except Exception as e:
+                print(f"⚠️ Reload failed, still serving the previous data: {e}")
+
+    def stats(self):
+        values = np.array(self.latencies) * 1000
+        percentiles = np.percentile(values, [50, 90, 99]).round(3).tolist() if len(values) else [None] * 3
+        return {"requests": len(values), "p50_ms": percentiles[0], "p90_ms": percentiles[1],
+                "p99_ms": percentiles[2], "reloads": self.reloads}
+
+    async def dispatch(self, target):
+        url = urlsplit(target)
+        if url.path == "/stats":
+            return 200, self.stats()
+        handler = ROUTES.get(url.path.rstrip("/") or "/")
+        if handler is None:
+            return 404, {"error": f"Unknown path '{url.path}'", "paths": sorted([*ROUTES, "/stats"])}
+        start = time.perf_counter()
+        try:
+            result = handler(self.state, parse_qs(url.query))
+            if inspect.isawaitable(result):
+                result = await result
+            return 200, result
+        except QueryError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2 or parts[0] not in ("GET", "HEAD"):
+                    status, payload = 400, {"error": "Only GET requests are supported"}
+                else:
+                    status, payload = await self.dispatch(parts[1])
+
+                body = json.dumps(payload, default=str).encode()
+                keep_alive = headers.get("connection", "").lower() != "close" and not request_line.endswith(b"HTTP/1.0\r\n")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + (body if parts and parts[0] != "HEAD" else b"")
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=host, port=port):
+        await self.reload()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🚀 Serving on http://{host}:{port} ({', '.join(sorted([*ROUTES, '/stats']))})")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.watch())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve NEPSE price, signal and holdings queries over local HTTP/JSON.")
+    parser.add_argument("--excel", default=excel_path)
+    parser.add_argument("--broker", default=broker_path)
+    parser.add_argument("--host", default=host)
+    parser.add_argument("--port", type=int, default=port)
+    args = parser.parse_args()
+    service = QueryService(args.excel, args.broker)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+PERCENT_FORMAT = "0.00%"
+SUPPORTED_FORMATS = ("xlsx", "parquet", "csv")
+
+
+def _cell_value(value):
+    """Converts numpy scalars and missing values into something openpyxl can write."""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_excel_stream(df, output_path, percent_columns=(), sheet_name="Sheet1"):
+    """Streams a DataFrame into xlsx with openpyxl's write-only (constant-memory) workbook.
+
+    Values in `percent_columns` are fractions (0.1234) written as numbers with an Excel
+    percent format, so the file reads as percentages but stays numeric when re-loaded.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+
+    header_font = Font(bold=True)
+    header = []
+    for name in df.columns:
+        cell = WriteOnlyCell(ws, value=str(name))
+        cell.font = header_font
+        header.append(cell)
+    ws.append(header)
+
+    percent_positions = {i for i, name in enumerate(df.columns) if name in percent_columns}
+    for row in df.itertuples(index=False, name=None):
+        cells = []
+        for i, value in enumerate(row):
+            value = _cell_value(value)
+            if i in percent_positions and value is not None:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.number_format = PERCENT_FORMAT
+                cells.append(cell)
+            else:
+                cells.append(value)
+        ws.append(cells)
+
+    wb.save(output_path)
+    return output_path
+
+
+def write_parquet(df, output_path):
+    """Writes a compact columnar file (needs pyarrow or fastparquet)."""
+    df.to_parquet(output_path, index=False)
+    return output_path
+
+
+def write_csv(df, output_path):
+    df.to_csv(output_path, index=False)
+    return output_path
+
+
+def write_results(df, output_path, output_format="xlsx", percent_columns=()):
+    """Writes a results table in the requested format, swapping the file extension to match."""
+    if output_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}', use one of {SUPPORTED_FORMATS}")
+    output_path = f"{os.path.splitext(output_path)[0]}.{output_format}"
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if output_format == "xlsx":
+        return write_excel_stream(df, output_path, percent_columns)
+    if output_format == "parquet":
+        return write_parquet(df, output_path)
+    return write_csv(df, output_path)
+
+
+def read_results(path):
+    """Loads a results file written by write_results back into a DataFrame."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext == ".csv":
+        return pd.read_csv(path)
+    return pd.read_excel(path, engine="openpyxl")
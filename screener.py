@@ -0,0 +1,245 @@
+import argparse
+import ast
+import re
+import time
+import numpy as np
+import pandas as pd
+from golden_cross import load_close_history, windows
+from Momentum import DAYS_MAP
+from cache import memoize
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+sma_windows = [5, 20, 50, 200]
+ema_windows = [38, 62]
+recent_window = 7
+
+BACKTICK_PATTERN = re.compile(r"`([^`]+)`")
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "rank": lambda values: pd.Series(values).rank(pct=True).to_numpy() * 100,
+}
+
+BINARY_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.BitAnd: np.logical_and,
+    ast.BitOr: np.logical_or,
+}
+
+COMPARE_OPS = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+
+def build_position_matrices(history):
+    """Pivots Symbol/Date/Close rows into position x symbol matrices, newest close in the last row.
+
+    Each column holds one symbol's own trading-day series, so rolling windows down the
+    rows behave exactly like the per-symbol rolling in golden_cross.
+    """
+    history = history.drop_duplicates(['Symbol', 'Date'], keep='last').sort_values(['Symbol', 'Date'])
+    history = history.assign(Position=-history.groupby('Symbol').cumcount(ascending=False))
+    closes = history.pivot(index='Position', columns='Symbol', values='Close').sort_index()
+    dates = history.pivot(index='Position', columns='Symbol', values='Date').sort_index()
+    return closes, dates
+
+
+def compute_returns(closes):
+    """Returns (as fractions, 0.05 = 5%) over DAYS_MAP trading-day horizons, matching Momentum's definition."""
+    latest = closes.iloc[-1]
+    returns = {}
+    for label, days in DAYS_MAP.items():
+        if days >= len(closes):
+            returns[label] = pd.Series(np.nan, index=closes.columns)
+            continue
+        start = closes.iloc[-1 - days]
+        returns[label] = (latest - start) / start
+    returns = pd.DataFrame(returns)
+    returns["Week-Month"] = (returns["One Week Return"].abs() - returns["One Month Return"].abs()).abs()
+    returns["Month>Week"] = returns["One Month Return"] > returns["One Week Return"]
+    return returns
+
+
+def compute_crossovers(sma, dates, short_window, long_window, recent_window):
+    """Golden/death cross flags for crosses that happened in the last `recent_window` unique dates."""
+    short, long = sma[short_window], sma[long_window]
+    above = short > long
+    below = short < long
+    golden = above & (short.shift(1) <= long.shift(1))
+    death = below & (short.shift(1) >= long.shift(1))
+
+    unique_dates = pd.Series(dates.to_numpy().ravel()).dropna().drop_duplicates().sort_values(ascending=False)
+    cutoff = unique_dates.iloc[:recent_window].min()
+    recent = dates >= cutoff
+    return {
+        f"GoldenCross{short_window}_{long_window}": (golden & recent).any(),
+        f"DeathCross{short_window}_{long_window}": (death & recent).any(),
+    }
+
+
+def count_broker_holdings(broker_path):
+    """Counts how many brokers hold each company in Top 1-5 of the latest Broker_Analysis sheet."""
+    from Broker_holdings import count_companies, preprocess, read_sheet
+    df = read_sheet(broker_path, sheet_name=pd.ExcelFile(broker_path, engine='openpyxl').sheet_names[0])
+    return count_companies(preprocess(df))
+
+
+@memoize(file_args=("excel_path", "broker_path"), modules=("Broker_holdings",),
+         depends=lambda: (DAYS_MAP, sma_windows, ema_windows, windows, recent_window))
+def build_universe(excel_path, broker_path=None, lookback_days=None):
+    """Builds one row per symbol with every column the screener can reference."""
+    history = load_close_history(excel_path, lookback_days)
+    history['Symbol'] = history['Symbol'].astype(str).str.strip().str.upper()
+    closes, dates = build_position_matrices(history)
+
+    columns = {"Close": closes.iloc[-1]}
+    columns.update(compute_returns(closes).to_dict(orient='series'))
+
+    sma = {n: closes.rolling(window=n, min_periods=n).mean() for n in sma_windows}
+    for n, values in sma.items():
+        columns[f"SMA{n}"] = values.iloc[-1]
+    for n in ema_windows:
+        columns[f"EMA{n}"] = closes.ewm(span=n, adjust=False).mean().iloc[-1]
+    for short_window, long_window in windows.values():
+        columns.update(compute_crossovers(sma, dates, short_window, long_window, recent_window))
+
+    universe = pd.DataFrame(columns)
+    if broker_path:
+        universe["Broker Holdings"] = count_broker_holdings(broker_path).reindex(universe.index).fillna(0)
+    universe.index.name = "Symbol"
+    return universe
+
+
+class Screener:
+    """Evaluates screen expressions as whole-universe array ops.
+
+    Expressions use Python syntax over universe columns; column names with spaces or
+    operators are quoted in backticks, e.g.
+    ``\\`One Month Return\\` > 0.10 and \\`Month>Week\\` and GoldenCross20_50``.
+    Returns are fractions like in Momentum.py, so 0.10 means 10%.
+    Every evaluated sub-expression is cached, so screens sharing terms reuse results.
+    """
+
+    def __init__(self, universe):
+        self.universe = universe
+        self.columns = {}
+        for name in universe.columns:
+            values = universe[name]
+            self.columns[name] = values.to_numpy(dtype=bool if values.dtype == bool else float)
+        self._compiled = {}
+        self._cache = {}
+
+    def compile(self, expression):
+        if expression not in self._compiled:
+            names = {}
+
+            def quote(match):
+                alias = f"__col{len(names)}"
+                names[alias] = match.group(1)
+                return alias
+
+            tree = ast.parse(BACKTICK_PATTERN.sub(quote, expression), mode='eval').body
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Name):
+                    node.id = names.get(node.id, node.id)
+            self._compiled[expression] = tree
+        return self._compiled[expression]
+
+    def evaluate(self, expression):
+        result = self._eval(self.compile(expression))
+        return np.broadcast_to(result, len(self.universe))
+
+    def screen(self, expression):
+        mask = self.evaluate(expression).astype(bool)
+        return self.universe[mask]
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _eval(self, node):
+        key = ast.dump(node)
+        if key not in self._cache:
+            self._cache[key] = self._eval_node(node)
+        return self._cache[key]
+
+    def _eval_node(self, node):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id not in self.columns:
+                raise KeyError(f"Unknown column '{node.id}'")
+            return self.columns[node.id]
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._eval(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, self._eval(value))
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand)
+            if isinstance(node.op, (ast.Not, ast.Invert)):
+                return np.logical_not(operand)
+            if isinstance(node.op, ast.USub):
+                return np.negative(operand)
+            return operand
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+            return BINARY_OPS[type(node.op)](self._eval(node.left), self._eval(node.right))
+        if isinstance(node, ast.Compare):
+            result = True
+            left = self._eval(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in COMPARE_OPS:
+                    raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+                right = self._eval(comparator)
+                result = np.logical_and(result, COMPARE_OPS[type(op)](left, right))
+                left = right
+            return result
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS:
+            return FUNCTIONS[node.func.id](*(self._eval(arg) for arg in node.args))
+        raise ValueError(f"Unsupported expression: {ast.unparse(node)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen NEPSE symbols with column expressions.")
+    parser.add_argument("expressions", nargs="*", help="e.g. \"`One Month Return` > 0.10 and `Month>Week` and GoldenCross20_50\"")
+    parser.add_argument("--excel", default=excel_path)
+    parser.add_argument("--broker", default=None, help="Broker_Analysis.xlsx path to add 'Broker Holdings' counts")
+    parser.add_argument("--columns", action="store_true", help="List the columns available to expressions")
+    args = parser.parse_args()
+
+    print("📊 Building universe...")
+    screener = Screener(build_universe(args.excel, args.broker))
+
+    if args.columns:
+        print(", ".join(screener.universe.columns))
+
+    for expression in args.expressions:
+        start = time.perf_counter()
+        try:
+            matches = screener.screen(expression)
+        except SyntaxError as e:
+            print(f"\n❌ {expression} -> invalid expression: {e.msg}")
+            continue
+        except KeyError as e:
+            print(f"\n❌ {expression} -> {e.args[0]} (use --columns to list them)")
+            continue
+        except (ValueError, TypeError) as e:
+            print(f"\n❌ {expression} -> {e}")
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n🔎 {expression} -> {len(matches)} symbols ({elapsed:.2f} ms)")
+        if not matches.empty:
+            print(matches.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import os
+import posixpath
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+import pandas as pd
+
+DATE_FORMAT = "%Y_%m_%d"
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_index_cache = {}
+_shared_strings_cache = {}
+
+
+class SheetEntry:
+    __slots__ = ("date", "name", "member")
+
+    def __init__(self, date, name, member):
+        self.date = date
+        self.name = name
+        self.member = member
+
+    def __repr__(self):
+        return f"SheetEntry({self.date:%Y-%m-%d}, {self.name!r}, {self.member!r})"
+
+
+class SheetIndex:
+    """Maps each dated sheet of an xlsx file to its worksheet XML member, oldest first.
+
+    Built from xl/workbook.xml and its relationships only, so no worksheet is parsed
+    until it is asked for.
+    """
+
+    __slots__ = ("path", "version", "entries", "shared_strings_member", "undated")
+
+    def __init__(self, path, version, entries, shared_strings_member, undated):
+        self.path = path
+        self.version = version
+        self.entries = entries
+        self.shared_strings_member = shared_strings_member
+        self.undated = undated
+
+    def __len__(self):
+        return len(self.entries)
+
+    def select(self, start=None, end=None, last=None):
+        """Entries with start <= date <= end (inclusive), or the `last` most recent ones."""
+        entries = [
+            e for e in self.entries
+            if (start is None or e.date >= pd.Timestamp(start)) and (end is None or e.date <= pd.Timestamp(end))
+        ]
+        if last is not None:
+            entries = entries[-last:] if last > 0 else []
+        return entries
+
+    def shared_strings(self, archive=None):
+        """The workbook's shared-strings table, parsed once per file version.
+
+        Only the latest version of each path is kept, so a file that keeps being
+        replaced does not pile up old tables.
+        """
+        if self.shared_strings_member is None:
+            return []
+        cached = _shared_strings_cache.get(self.path)
+        if cached is None or cached[0] != self.version:
+            if archive is None:
+                with zipfile.ZipFile(self.path) as zf:
+                    strings = _parse_shared_strings(zf, self.shared_strings_member)
+            else:
+                strings = _parse_shared_strings(archive, self.shared_strings_member)
+            cached = (self.version, strings)
+            _shared_strings_cache[self.path] = cached
+        return cached[1]
+
+    def read(self, entry, usecols=None, archive=None):
+        """Reads one sheet into a DataFrame using its first non-blank row as the header."""
+        if archive is None:
+            with zipfile.ZipFile(self.path) as zf:
+                return self.read(entry, usecols, zf)
+        shared = self.shared_strings(archive)
+        with archive.open(entry.member) as f:
+            rows = _parse_rows(f, shared)
+        if not rows:
+            return pd.DataFrame()
+        width = max(len(r) for r in rows)
+        header = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(rows[0] + [None] * (width - len(rows[0])))]
+        body = [r + [None] * (width - len(r)) for r in rows[1:]]
+        df = pd.DataFrame(body, columns=header)
+        if usecols is not None:
+            df = df[[c for c in usecols if c in df.columns]]
+        return df
+
+    def read_range(self, start=None, end=None, last=None, usecols=None):
+        """Reads the selected sheets in date order as a list of (date, DataFrame)."""
+        with zipfile.ZipFile(self.path) as zf:
+            return [(e.date, self.read(e, usecols, zf)) for e in self.select(start, end, last)]
+
+
+def file_version(path):
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def get_sheet_index(path, date_format=DATE_FORMAT):
+    """Returns the SheetIndex for `path`, rebuilding it only when the file changes."""
+    path = os.path.abspath(path)
+    version = file_version(path)
+    key = (path, date_format)
+    cached = _index_cache.get(key)
+    if cached is None or cached.version != version:
+        cached = build_sheet_index(path, version, date_format)
+        _index_cache[key] = cached
+    return cached
+
+
+def build_sheet_index(path, version=None, date_format=DATE_FORMAT):
+    with zipfile.ZipFile(path) as zf:
+        workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+        rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+
+    targets = {}
+    shared_strings_member = None
+    for rel in rels.iter(f"{PKG_REL_NS}Relationship"):
+        member = _resolve_member(rel.get("Target"))
+        targets[rel.get("Id")] = member
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            shared_strings_member = member
+
+    entries, undated = [], []
+    for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+        name = sheet.get("name")
+        member = targets.get(sheet.get(f"{REL_NS}id"))
+        try:
+            entries.append(SheetEntry(datetime.strptime(name, date_format), name, member))
+        except ValueError:
+            undated.append(name)
+    entries.sort(key=lambda e: e.date)
+    return SheetIndex(path, version or file_version(path), entries, shared_strings_member, undated)
+
+
+def _resolve_member(target):
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _text(element):
+    return "".join(t.text or "" for t in element.iter(f"{MAIN_NS}t"))
+
+
+def _parse_shared_strings(archive, member):
+    strings = []
+    with archive.open(member) as f:
+        for _, element in ET.iterparse(f):
+            if element.tag == f"{MAIN_NS}si":
+                strings.append(_text(element))
+                element.clear()
+    return strings
+
+
+def _column_index(ref):
+    index = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
+
+
+def _parse_rows(f, shared):
+    """Cell values of every non-blank row, in sheet order. Cells are placed by their `r`
+    reference; rows that are missing, or only hold empty (e.g. styled) cells, are skipped."""
+    rows = []
+    for _, element in ET.iterparse(f):
+        if element.tag != f"{MAIN_NS}row":
+            continue
+        values = []
+        for cell in element.iter(f"{MAIN_NS}c"):
+            ref = cell.get("r")
+            col = _column_index(ref) if ref else len(values)
+            values.extend([None] * (col - len(values)))
+            values.append(_cell_value(cell, shared))
+        if any(v is not None and v != "" for v in values):
+            rows.append(values)
+        element.clear()
+    return rows
+
+
+def _cell_value(cell, shared):
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return _text(cell)
+    v = cell.find(f"{MAIN_NS}v")
+    if v is None or v.text is None:
+        return None
+    if cell_type == "s":
+        return shared[int(v.text)]
+    if cell_type == "b":
+        return v.text == "1"
+    if cell_type in ("str", "e"):
+        return v.text
+    value = float(v.text)
+    return int(value) if value.is_integer() else value
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "combined_excel.xlsx"
+    index = get_sheet_index(path)
+    print(f"📑 {len(index)} dated sheets in {path}"
+          + (f" ({index.entries[0].date:%Y-%m-%d} → {index.entries[-1].date:%Y-%m-%d})" if index.entries else ""))
+    if index.undated:
+        print(f"⚠️ Sheets without a {DATE_FORMAT} name: {', '.join(index.undated)}")
@@ -2,7 +2,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from volume import add_volume_indicators
+from cache import memoize
 
+@memoize(file_args=("file_path",))
 def load_symbol_data_from_excel(file_path, symbol):
     xls = pd.ExcelFile(file_path)
     combined_data = []
@@ -65,6 +68,11 @@ def calculate_sling_shot(df):
 
     df['Cons_Long'] = (df['EMA38'] > df['EMA62']) & (df['Close'].shift(1) < df['EMA38']) & (df['Close'] > df['EMA38'])
     df['Cons_Short'] = (df['EMA38'] < df['EMA62']) & (df['Close'].shift(1) > df['EMA38']) & (df['Close'] < df['EMA38'])
+
+    # Volume confirmation from the Vol column the loader already cleaned
+    df = add_volume_indicators(df).reset_index(drop=True)
+    df['Cons_Long_Vol'] = df['Cons_Long'] & df['VolConfirmed']
+    df['Cons_Short_Vol'] = df['Cons_Short'] & df['VolConfirmed']
     return df
 
 def plot_sling_shot(df, symbol, filename="sling_shot_chart.png"):
@@ -98,6 +106,12 @@ def plot_sling_shot(df, symbol, filename="sling_shot_chart.png"):
     ax.scatter(df.loc[df['Cons_Short'], 'Date'], df.loc[df['Cons_Short'], 'High'] * 1.005,
                label='Conservative Short', marker='v', color='red')
 
+    # Ring the conservative entries that came on above-average volume
+    ax.scatter(df.loc[df['Cons_Long_Vol'], 'Date'], df.loc[df['Cons_Long_Vol'], 'Low'] * 0.995,
+               label='Volume Confirmed', marker='o', s=160, facecolors='none', edgecolors='black')
+    ax.scatter(df.loc[df['Cons_Short_Vol'], 'Date'], df.loc[df['Cons_Short_Vol'], 'High'] * 1.005,
+               marker='o', s=160, facecolors='none', edgecolors='black')
+
     # Annotate trend changes
     for i in range(1, len(df)):
         if df['Trend'].iloc[i] == 'Up' and df['Trend'].iloc[i - 1] != 'Up':
@@ -0,0 +1,60 @@
+import asyncio
+from pathlib import Path
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from broker_picks import BROKER_HEADER, TOP_HEADERS, save_rows_to_workbook, scrape_broker_picks, to_sheet_layout
+from broker_rankings import count_top_companies
+
+FIXTURE = Path(__file__).parent / "fixtures" / "broker_picks.html"
+
+HEADERS = [BROKER_HEADER, *TOP_HEADERS]
+ROWS = [
+    ["B1", "CHDC/18832/2,663.89", "RADHI/33056/812.81", "MERO/24699/779.40", "EBL/25202/645.05", "NRN/7570/2,141.06"],
+    ["B3", "SHPC/16325/615.89", "BHDC/18219/479.10", "CHDC/2998/2,655.02", "RADHI/9211/815.33", "NIFRA/25110/279.40"],
+    ["B4", "RADHI/12040/818.00", "MERO/8803/781.15", "NRN/2210/2,139.77", "HIDCL/40120/231.62", "EBL/3870/644.10"],
+]
+
+
+def scrape_fixture():
+    try:
+        return asyncio.run(scrape_broker_picks(FIXTURE.resolve().as_uri()))
+    except Exception as e:
+        if "Executable doesn't exist" in str(e) or "playwright install" in str(e):
+            pytest.skip("Playwright Chromium is not installed")
+        raise
+
+
+def test_extract_table_from_saved_page():
+    headers, rows = scrape_fixture()
+    assert headers == HEADERS
+    assert rows == ROWS
+
+
+def test_to_sheet_layout_maps_headers():
+    headers = ["Broker", "TOP 2", "Top1", "Extra", "Top 3", "top 4", "Top 5"]
+    rows = [["B1", "b", "a", "x", "c", "d", "e"]]
+    assert to_sheet_layout(headers, rows) == (HEADERS, [["B1", "a", "b", "c", "d", "e"]])
+
+
+@pytest.mark.parametrize("headers", [
+    [],
+    [BROKER_HEADER, "Top 1", "Top 2", "Top 3", "Top 4"],
+    [*TOP_HEADERS, "Top 6"],
+])
+def test_to_sheet_layout_rejects_other_tables(headers):
+    with pytest.raises(ValueError):
+        to_sheet_layout(headers, [["x"] * len(headers)])
+
+
+def test_save_rows_to_workbook_puts_latest_sheet_first(tmp_path):
+    path = tmp_path / "Broker_Analysis.xlsx"
+    save_rows_to_workbook(HEADERS, ROWS[:1], path, "2025-07-09")
+    save_rows_to_workbook(*to_sheet_layout(HEADERS, ROWS), path, "2025-07-10")
+
+    assert load_workbook(path).sheetnames == ["2025-07-10", "2025-07-09"]
+    df = pd.read_excel(path, sheet_name=0)
+    assert list(df.columns) == HEADERS
+    assert len(df) == len(ROWS)
+    counts = count_top_companies(df, TOP_HEADERS)
+    assert counts["RADHI"] == 3 and counts["CHDC"] == 2
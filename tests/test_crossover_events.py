@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from crossover_events import CrossoverIndex, update_index
+from market_data import MarketData, SymbolTable
+from slingshot import calculate_sling_shot
+
+PAIRS = [(5, 20), (20, 50)]
+
+
+def make_data(n_days=240, seed=0, illiquid_every=3):
+    """Three random-walk symbols; ILQ repeats its close on most days like a thinly traded stock."""
+    rng = np.random.default_rng(seed)
+    calendar = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-01") + n_days, dtype="datetime64[D]")
+    symbols = SymbolTable(["AAA", "BBB", "ILQ"])
+    codes, dates, closes = [], [], []
+    for code in range(len(symbols)):
+        close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days))), 2)
+        if symbols.names[code] == "ILQ":
+            close = pd.Series(np.where(np.arange(n_days) % illiquid_every == 0, close, np.nan)).ffill().to_numpy()
+        codes.append(np.full(n_days, code))
+        dates.append(np.arange(n_days))
+        closes.append(close)
+    close = np.concatenate(closes)
+    return MarketData(symbols, calendar, np.concatenate(codes), np.concatenate(dates),
+                      close, close * 1.01, close * 0.99, close, np.full(len(close), 1000))
+
+
+def build(data):
+    index = CrossoverIndex(PAIRS)
+    index.update(data)
+    return index
+
+
+def test_incremental_updates_match_full_build():
+    data = make_data()
+    full = build(data)
+    index = CrossoverIndex(PAIRS)
+    for end in list(data.calendar[30::45]) + [data.calendar[-1]]:
+        index.update(data.between(end=end))
+    pd.testing.assert_frame_equal(index.between(), full.between())
+    assert index.fingerprint == full.fingerprint
+    assert len(full) > 0
+
+
+def test_update_index_rebuilds_when_indexed_days_change(tmp_path):
+    path = str(tmp_path / "index.npz")
+    update_index(None, path, PAIRS, data=make_data(seed=0))
+
+    # same dates, different prices, e.g. a re-downloaded workbook with corrected sheets
+    longer = make_data(n_days=260, seed=1)
+    changed = longer.between(end=longer.calendar[239])
+    index = update_index(None, path, PAIRS, data=changed)
+    pd.testing.assert_frame_equal(index.between(), build(changed).between())
+
+    # unchanged history with new days appended is extended, not rebuilt
+    assert CrossoverIndex.load(path).matches(longer)
+    index = update_index(None, path, PAIRS, data=longer)
+    pd.testing.assert_frame_equal(index.between(), build(longer).between())
+
+
+@pytest.mark.parametrize("symbol", ["AAA", "ILQ"])
+def test_trend_flips_match_slingshot(symbol):
+    data = make_data()
+    index = build(data)
+    df = calculate_sling_shot(data.symbol(symbol).to_frame())
+    previous = df["Trend"].shift(1)
+    for kind, trend in (("TrendUp", "Up"), ("TrendDown", "Down")):
+        expected = df.loc[(df["Trend"] == trend) & (previous != trend) & previous.notna(), "Date"]
+        events = index.between(kind=kind, symbol=symbol)
+        assert list(events["Date"]) == list(expected.astype("datetime64[s]")), kind
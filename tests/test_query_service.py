@@ -0,0 +1,64 @@
+import asyncio
+import os
+import numpy as np
+import pytest
+from openpyxl import Workbook
+import cache
+from crossover_events import CrossoverIndex
+from market_data import load_market_data
+from query_service import QueryService
+
+N_DAYS = 90
+SYMBOLS = ["AAA", "BBB", "CCC"]
+
+
+def write_workbook(path, seed, mtime):
+    """combined_excel.xlsx-shaped workbook: one %Y_%m_%d sheet per day, newest first."""
+    rng = np.random.default_rng(seed)
+    closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (N_DAYS, len(SYMBOLS))), axis=0)), 2)
+    days = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-01") + N_DAYS, dtype="datetime64[D]")
+    wb = Workbook()
+    wb.remove(wb.active)
+    for day, row in reversed(list(zip(days, closes))):
+        ws = wb.create_sheet(day.item().strftime("%Y_%m_%d"))
+        ws.append(["Symbol", "Open", "High", "Low", "Close", "Vol"])
+        for symbol, close in zip(SYMBOLS, row):
+            ws.append([symbol, close, round(close * 1.01, 2), round(close * 0.99, 2), close, 1000])
+    wb.save(path)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def no_disk_cache(monkeypatch):
+    monkeypatch.setattr(cache, "ENABLED", False)
+
+
+def test_reload_after_historical_sheets_change(tmp_path, no_disk_cache):
+    excel = str(tmp_path / "combined_excel.xlsx")
+    service = QueryService(excel, str(tmp_path / "missing.xlsx"), index_path=str(tmp_path / "index.npz"))
+
+    async def query(path):
+        status, payload = await service.dispatch(path)
+        assert status == 200, payload
+        return payload
+
+    async def run():
+        write_workbook(excel, seed=0, mtime=1_700_000_000)
+        await service.reload()
+        before = await query("/crossovers")
+
+        # same dates, different prices: a re-downloaded workbook with corrected sheets
+        write_workbook(excel, seed=1, mtime=1_700_000_100)
+        await service.reload()
+        return before, await query("/crossovers"), await query("/history?symbol=AAA&start=2024-01-01&end=2024-01-01")
+
+    before, after, history = asyncio.run(run())
+    data = load_market_data(excel)
+    expected = CrossoverIndex()
+    expected.update(data)
+
+    assert after != before
+    assert [e["Date"][:10] for e in after] == [str(d)[:10] for d in expected.between()["Date"]]
+    assert [(e["Symbol"], e["Event"], e["Window"]) for e in after] == list(
+        expected.between()[["Symbol", "Event", "Window"]].itertuples(index=False, name=None))
+    assert history[0]["Close"] == round(float(data.symbol("AAA").close[0]), 2)
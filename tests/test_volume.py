@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+from volume import add_volume_indicators, relative_volume_window
+
+
+def test_zero_prior_volume_is_not_a_spike():
+    n = relative_volume_window + 5
+    df = pd.DataFrame({
+        "Symbol": "A",
+        "Date": pd.date_range("2024-01-01", periods=n),
+        "Close": np.arange(n, dtype=float) + 10,
+        "Vol": [0] * (n - 1) + [500],  # missing volume loads as 0
+    })
+    out = add_volume_indicators(df)
+    assert not np.isinf(out["RelVol"]).any()
+    assert not out["VolConfirmed"].any()
@@ -0,0 +1,70 @@
+import sys
+import numpy as np
+import pandas as pd
+from market_data import load_market_data
+
+# --- CONFIG ---
+excel_path = "combined_excel.xlsx"
+volume_ma_windows = [20, 50]
+vwap_window = 20
+relative_volume_window = 20
+volume_confirm_ratio = 1.5  # today's volume vs. the prior relative_volume_window-day average
+
+
+def add_volume_indicators(df):
+    """Adds OBV, volume averages, relative volume and rolling VWAP columns to a long
+    Symbol/Date/Close/Vol frame (High/Low are used for the typical price when present).
+
+    Every column is computed for all symbols at once with grouped rolling ops; the result
+    is sorted by Symbol and Date.
+    """
+    df = df.sort_values(['Symbol', 'Date'])
+    by_symbol = df.groupby('Symbol', sort=False, observed=True)
+    volume = df['Vol'].astype(float)
+
+    direction = np.sign(by_symbol['Close'].diff()).fillna(0)
+    df['OBV'] = (direction * volume).groupby(df['Symbol'], sort=False, observed=True).cumsum()
+
+    def rolling(values, window, how="mean"):
+        grouped = values.groupby(df['Symbol'], sort=False, observed=True).rolling(window=window, min_periods=window)
+        return getattr(grouped, how)().reset_index(level=0, drop=True)
+
+    for n in volume_ma_windows:
+        df[f'VolMA{n}'] = rolling(volume, n)
+
+    prior_volume = volume.groupby(df['Symbol'], sort=False, observed=True).shift(1)
+    prior_average = rolling(prior_volume, relative_volume_window)
+    # missing volume is loaded as 0; no prior volume means no ratio, not an infinite spike
+    df['RelVol'] = volume / prior_average.where(prior_average > 0)
+    df['VolConfirmed'] = df['RelVol'] >= volume_confirm_ratio
+
+    if 'High' in df.columns and 'Low' in df.columns:
+        typical = (df['High'] + df['Low'] + df['Close']) / 3
+    else:
+        typical = df['Close']
+    df[f'VWAP{vwap_window}'] = rolling(typical * volume, vwap_window, "sum") / rolling(volume, vwap_window, "sum")
+    df['VWAP_Dist%'] = (df['Close'] / df[f'VWAP{vwap_window}'] - 1) * 100
+    return df
+
+
+def compute_volume_indicators(data):
+    """Volume indicators for every symbol of a MarketData container, over trading days only."""
+    return add_volume_indicators(data.drop_unchanged_closes().to_frame())
+
+
+def volume_note(row):
+    """Short text used next to a signal, e.g. "Vol 2.31x avg ✅"."""
+    rel_vol = row.get('RelVol')
+    if rel_vol is None or pd.isna(rel_vol):
+        return "Vol n/a"
+    return f"Vol {rel_vol:.2f}x avg {'✅' if rel_vol >= volume_confirm_ratio else '❌'}"
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else excel_path
+    print(f"📊 Loading {path}...")
+    indicators = compute_volume_indicators(load_market_data(path))
+    latest = indicators.groupby('Symbol', observed=True).tail(1).set_index('Symbol')
+    spikes = latest[latest['VolConfirmed']].sort_values('RelVol', ascending=False)
+    print(f"\n🔊 Relative-volume spikes (>= {volume_confirm_ratio}x) on the latest day:")
+    print(spikes[['Date', 'Close', 'Vol', 'RelVol', 'OBV', f'VWAP{vwap_window}', 'VWAP_Dist%']].round(2).to_string())